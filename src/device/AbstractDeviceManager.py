@@ -1,11 +1,28 @@
 from abc import ABC, abstractmethod
 from typing import List, Dict, Optional, Callable, Any
 from datetime import datetime
-import copy
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+import json
+import os
+import queue
+import tempfile
+import threading
+import time
+
+# Last known device list, used to warm-start hotplug monitors
+SNAPSHOT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "openterface", "devices.json")
 
 class DeviceInfo:
     """Data class to represent device information in a cross-platform way"""
     
+    __slots__ = ('port_chain', 'serial_port', 'serial_port_path', 'hid_device', 'hid_path',
+                 'camera_device', 'camera_path', 'audio_device', 'audio_path',
+                 'platform_specific', '_unique_key', '_dict_cache', '_repr_str', '_brief')
+    
+    # The unique key, dictionary and display strings are built on first use and kept, so
+    # backends fill in every field before handing the device out and don't change it afterwards
+    
     def __init__(self, 
                  port_chain: str = "",
                  serial_port: str = "",
@@ -42,9 +59,18 @@ class DeviceInfo:
         self.audio_device = audio_device
         self.audio_path = audio_path
         self.platform_specific = platform_specific or {}
+        self._unique_key = None
+        self._dict_cache = None
+        self._repr_str = None
+        self._brief = None
         
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for compatibility"""
+        """Convert to dictionary for compatibility; the caller owns the result, platform_specific included"""
+        device_dict = self._build_dict()
+        device_dict['platform_specific'] = dict(self.platform_specific)
+        return device_dict
+    
+    def _build_dict(self) -> Dict[str, Any]:
         return {
             'port_chain': self.port_chain,
             'serial_port': self.serial_port,
@@ -58,6 +84,14 @@ class DeviceInfo:
             'platform_specific': self.platform_specific
         }
     
+    def as_dict(self) -> Dict[str, Any]:
+        """Like to_dict, but builds the dictionary once and returns the same object afterwards; don't mutate it"""
+        cached = self._dict_cache
+        if cached is None:
+            cached = self._build_dict()
+            self._dict_cache = cached
+        return cached
+    
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'DeviceInfo':
         """Create from dictionary for compatibility"""
@@ -76,16 +110,52 @@ class DeviceInfo:
     
     def get_unique_key(self) -> str:
         """Generate a unique key for this device"""
-        return f"{self.port_chain}-{self.serial_port}-{self.hid_device}"
+        key = self._unique_key
+        if key is None:
+            key = f"{self.port_chain}-{self.serial_port}-{self.hid_device}"
+            self._unique_key = key
+        return key
+    
+    def _mutable_tuple(self) -> tuple:
+        """Fields that can change while the unique key stays the same (paths shift on replug)"""
+        return (self.serial_port_path, self.hid_path, self.camera_device, self.camera_path,
+                self.audio_device, self.audio_path)
     
     def __eq__(self, other) -> bool:
         """Check equality with another DeviceInfo"""
+        if self is other:
+            return True
         if not isinstance(other, DeviceInfo):
             return False
         return self.get_unique_key() == other.get_unique_key()
     
+    def __hash__(self) -> int:
+        """Hash by unique key so devices can be used in sets and as dict keys"""
+        return hash(self.get_unique_key())
+    
     def __str__(self) -> str:
-        """String representation"""
+        """String representation, built once per set of field values"""
+        cached = self._repr_str
+        if cached is None:
+            cached = self._format_str()
+            self._repr_str = cached
+        return cached
+    
+    @property
+    def brief(self) -> str:
+        """Short summary of the available interfaces, e.g. Serial:/dev/ttyUSB0 | Video | HID"""
+        cached = self._brief
+        if cached is None:
+            cached = " | ".join(filter(None, (
+                self.serial_port_path and f"Serial:{self.serial_port_path}",
+                self.camera_path and "Video",
+                self.audio_path and "Audio",
+                self.hid_path and "HID"
+            ))) or "Unknown device"
+            self._brief = cached
+        return cached
+    
+    def _format_str(self) -> str:
         parts = []
         if self.serial_port_path:
             parts.append(f"Serial:{self.serial_port_path}")
@@ -98,51 +168,101 @@ class DeviceInfo:
         return f"Device[{self.port_chain}]: " + " | ".join(parts) if parts else f"Device[{self.port_chain}]: Unknown"
 
 
+def _device_map(devices: List[DeviceInfo]) -> Dict[str, DeviceInfo]:
+    """Key a device list by unique key"""
+    return {dev.get_unique_key(): dev for dev in devices}
+
+
+def _diff(current_devices: Dict[str, DeviceInfo], other_devices: Dict[str, DeviceInfo]) -> Dict[str, List[DeviceInfo]]:
+    """Compare two device maps built by _device_map"""
+    current_keys = current_devices.keys()
+    other_keys = other_devices.keys()
+    changes = {
+        'added_devices': [current_devices[key] for key in current_keys - other_keys],
+        'removed_devices': [other_devices[key] for key in other_keys - current_keys],
+        'modified_devices': []
+    }
+    
+    # Devices present in both are modified if any of their non-key fields differs
+    for key in current_keys & other_keys:
+        device = current_devices[key]
+        other = other_devices[key]
+        if device is not other and device._mutable_tuple() != other._mutable_tuple():
+            changes['modified_devices'].append({
+                'old': other,
+                'new': device
+            })
+    
+    return changes
+
+
+def _json_default(value):
+    """Encode bytes (HID paths) so they survive a JSON round trip"""
+    if isinstance(value, bytes):
+        return {'__bytes__': value.decode('latin-1')}
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _json_object_hook(obj):
+    if '__bytes__' in obj:
+        return obj['__bytes__'].encode('latin-1')
+    return obj
+
+
 class DeviceSnapshot:
     """Cross-platform device snapshot for comparing device states"""
     
     def __init__(self, devices: List[DeviceInfo]):
-        self.timestamp = datetime.now()
+        # Monotonic nanoseconds for ordering; wall-clock time is only turned into a datetime on demand
+        self.timestamp_ns = time.monotonic_ns()
+        self._wall_time = time.time()
+        self._timestamp = None
         self.devices = devices
+        self._as_dict_list = None
+        self._device_map = None
+        self._by_port_chain = None
+        
+    @property
+    def timestamp(self) -> datetime:
+        """Wall-clock time the snapshot was taken"""
+        if self._timestamp is None:
+            self._timestamp = datetime.fromtimestamp(self._wall_time)
+        return self._timestamp
+        
+    @property
+    def as_dict_list(self) -> List[Dict[str, Any]]:
+        """The devices' cached dictionaries, built on first access; don't mutate it"""
+        if self._as_dict_list is None:
+            self._as_dict_list = [dev.as_dict() for dev in self.devices]
+        return self._as_dict_list
+        
+    @property
+    def by_port_chain(self) -> Dict[str, List[Dict[str, Any]]]:
+        """The devices' cached dictionaries grouped by port chain, built on first access; don't mutate it"""
+        if self._by_port_chain is None:
+            grouped = defaultdict(list)
+            for device_dict in self.as_dict_list:
+                grouped[device_dict['port_chain']].append(device_dict)
+            self._by_port_chain = dict(grouped)
+        return self._by_port_chain
+        
+    @property
+    def device_map(self) -> Dict[str, DeviceInfo]:
+        """The devices keyed by unique key, built on first access; don't mutate it"""
+        if self._device_map is None:
+            self._device_map = _device_map(self.devices)
+        return self._device_map
         
     def compare_with(self, other: 'DeviceSnapshot') -> Dict[str, List[DeviceInfo]]:
         """Compare this snapshot with another snapshot"""
-        changes = {
-            'added_devices': [],
-            'removed_devices': [],
-            'modified_devices': []
-        }
-        
-        # Convert device lists to dictionaries for easier comparison
-        current_devices = {dev.get_unique_key(): dev for dev in self.devices}
-        other_devices = {dev.get_unique_key(): dev for dev in other.devices}
-        
-        # Find added devices
-        for key, device in current_devices.items():
-            if key not in other_devices:
-                changes['added_devices'].append(device)
-        
-        # Find removed devices
-        for key, device in other_devices.items():
-            if key not in current_devices:
-                changes['removed_devices'].append(device)
-        
-        # Find modified devices (currently just checking if different objects)
-        for key, device in current_devices.items():
-            if key in other_devices:
-                if device.to_dict() != other_devices[key].to_dict():
-                    changes['modified_devices'].append({
-                        'old': other_devices[key],
-                        'new': device
-                    })
-        
-        return changes
+        return _diff(self.device_map, other.device_map)
 
 
 class AbstractDeviceManager(ABC):
     """Abstract base class for cross-platform device management"""
     
-    def __init__(self, serial_vid: str, serial_pid: str, hid_vid: str, hid_pid: str):
+    def __init__(self, serial_vid: str, serial_pid: str, hid_vid: str, hid_pid: str,
+                 cache_ttl: float = 0.5):
         """
         Initialize the device manager
         
@@ -151,17 +271,103 @@ class AbstractDeviceManager(ABC):
             serial_pid: Product ID for serial devices
             hid_vid: Vendor ID for HID devices
             hid_pid: Product ID for HID devices
+            cache_ttl: Time in seconds a discovery result is reused by discover_devices
         """
         self.serial_vid = serial_vid
         self.serial_pid = serial_pid
         self.hid_vid = hid_vid
         self.hid_pid = hid_pid
+        # Integer forms for backends whose enumeration APIs report numeric VID/PID
+        self._serial_vid_i = int(serial_vid, 16)
+        self._serial_pid_i = int(serial_pid, 16)
+        self._hid_vid_i = int(hid_vid, 16)
+        self._hid_pid_i = int(hid_pid, 16)
+        self.cache_ttl = cache_ttl
+        self._cache_devices = None
+        self._cache_ts = 0  # time.monotonic_ns() of the cached discovery
+        self._cache_generation = 0
+        # Worker pool for _enumerate_parallel, kept for the manager's lifetime so per-thread
+        # OS handles (e.g. udev contexts) survive from one discovery to the next
+        self._executor = None
+        self._executor_lock = threading.Lock()
         
-    @abstractmethod
-    def discover_devices(self) -> List[DeviceInfo]:
+    def discover_devices(self, force_refresh: bool = False) -> List[DeviceInfo]:
         """
         Discover all devices matching the specified VID/PID
         
+        Back-to-back calls within cache_ttl seconds share one enumeration.
+        
+        Args:
+            force_refresh: Enumerate even if a cached result is still fresh
+            
+        Returns:
+            List of DeviceInfo objects representing found devices
+        """
+        # Read the timestamp before the devices: _store_discovery writes them in the opposite order
+        cache_ts = self._cache_ts
+        devices = self._cache_devices
+        if not force_refresh and devices is not None and time.monotonic_ns() - cache_ts < self.cache_ttl * 1_000_000_000:
+            return list(devices)
+        devices = self._discover_devices_impl()
+        self._store_discovery(devices)
+        return list(devices)
+    
+    @property
+    def cache_generation(self) -> int:
+        """Counter that changes whenever the cached discovery result is replaced or dropped"""
+        return self._cache_generation
+    
+    def invalidate_cache(self):
+        """Drop the cached discovery result, e.g. after a hotplug event"""
+        self._cache_devices = None
+        self._cache_generation += 1
+    
+    def _store_discovery(self, devices: List[DeviceInfo]):
+        """Record a discovery result for discover_devices to reuse"""
+        self._cache_devices = devices
+        self._cache_ts = time.monotonic_ns()
+        self._cache_generation += 1
+    
+    def _enumerate_parallel(self, sources: List[Callable[[], Any]], max_workers: int = 4) -> List[Any]:
+        """
+        Run independent enumeration callables concurrently
+        
+        Backends use this for enumeration calls that block on separate OS subsystems
+        (e.g. building the udev, ALSA, HID and serial indexes); cheap in-memory lookups
+        should run inline instead.
+        
+        Args:
+            sources: Callables taking no arguments
+            max_workers: Upper bound on concurrent lookups, fixed by the first call
+            
+        Returns:
+            The callables' results, in the order of sources
+        """
+        if len(sources) <= 1:
+            return [source() for source in sources]
+        executor = self._executor
+        if executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                                        thread_name_prefix="device-enum")
+                executor = self._executor
+        futures = [executor.submit(source) for source in sources]
+        return [future.result() for future in futures]
+    
+    def is_serial_match(self, vid: int, pid: int) -> bool:
+        """Whether a numeric VID/PID is the serial device's"""
+        return vid == self._serial_vid_i and pid == self._serial_pid_i
+    
+    def is_hid_match(self, vid: int, pid: int) -> bool:
+        """Whether a numeric VID/PID is the HID device's"""
+        return vid == self._hid_vid_i and pid == self._hid_pid_i
+    
+    @abstractmethod
+    def _discover_devices_impl(self) -> List[DeviceInfo]:
+        """
+        Enumerate all devices matching the specified VID/PID, bypassing the cache
+        
         Returns:
             List of DeviceInfo objects representing found devices
         """
@@ -193,68 +399,124 @@ class AbstractDeviceManager(ABC):
         all_devices = self.discover_devices()
         return [dev for dev in all_devices if dev.port_chain == target_port_chain]
     
-    def list_available_port_chains(self) -> List[str]:
+    def list_available_port_chains(self, sort: bool = True) -> List[str]:
         """
         List all available port chains
         
+        Args:
+            sort: Return the port chains sorted; pass False when order doesn't matter
+        
         Returns:
             List of unique port chain strings
         """
         all_devices = self.discover_devices()
-        port_chains = set(dev.port_chain for dev in all_devices if dev.port_chain)
-        return sorted(list(port_chains))
+        port_chains = {dev.port_chain for dev in all_devices if dev.port_chain}
+        return sorted(port_chains) if sort else list(port_chains)
     
-    def create_snapshot(self) -> DeviceSnapshot:
+    def create_snapshot(self, force_refresh: bool = True) -> DeviceSnapshot:
         """
         Create a snapshot of current device state
         
+        Args:
+            force_refresh: Enumerate even if a cached discovery result is still fresh
+        
         Returns:
             DeviceSnapshot object
         """
-        devices = self.discover_devices()
+        devices = self.discover_devices(force_refresh=force_refresh)
         return DeviceSnapshot(devices)
 
 
 class AbstractHotplugMonitor(ABC):
     """Abstract base class for cross-platform hotplug monitoring"""
     
-    def __init__(self, device_manager: AbstractDeviceManager, poll_interval: float = 2.0):
+    def __init__(self, device_manager: AbstractDeviceManager, poll_interval: float = 2.0,
+                 warm_start: bool = False):
         """
         Initialize the hotplug monitor
         
         Args:
             device_manager: The device manager to use for discovery
-            poll_interval: Time in seconds between device scans
+            poll_interval: Time in seconds between device scans when polling, and the
+                           longest single wait for an OS device notification otherwise
+            warm_start: Start from the device list saved by the previous run, if recent,
+                        and reconcile it with a real discovery in the background; the
+                        device list is saved to snapshot_cache_path only when enabled
         """
         self.device_manager = device_manager
         self.poll_interval = poll_interval
-        self.callbacks = []
+        self.warm_start = warm_start
+        self.snapshot_cache_path = SNAPSHOT_CACHE_PATH
+        self.snapshot_cache_max_age = 600.0
+        self._reconcile_pending = False
+        # A burst of OS device events (a hub and its children arriving) is handled as one change once
+        # no further event has come for _debounce seconds, or _debounce_max after the first one
+        self._debounce = 0.15
+        self._debounce_max = 0.5
+        # Change events are handed to a dispatcher thread so slow callbacks don't delay detection
+        self._event_queue = queue.SimpleQueue()
+        self._dispatch_thread = None
+        # Insertion-ordered set of callbacks (values are unused)
+        self.callbacks = {}
         self.running = False
+        # Set by stop_monitoring to cut the monitor thread's current wait short
+        self._stop_event = threading.Event()
         self.thread = None
         self.initial_snapshot = None
         self.last_snapshot = None
+        # Set once initial_snapshot is available, which the monitor thread enumerates first
+        self.initial_ready = threading.Event()
+        # Net (added, removed, modified) maps since initial_snapshot, folded in one change at a time;
+        # None when a change went by untracked and the next query must diff in full.
+        # Folded in by the monitor thread and read from others, so both hold _net_lock
+        self._net_delta = None
+        self._net_lock = threading.Lock()
         
     def add_callback(self, callback: Callable):
         """Add a callback function to be called when device changes are detected"""
-        self.callbacks.append(callback)
+        self.callbacks[callback] = None
         
     def remove_callback(self, callback: Callable):
         """Remove a callback function"""
-        if callback in self.callbacks:
-            self.callbacks.remove(callback)
+        self.callbacks.pop(callback, None)
     
-    def start_monitoring(self):
-        """Start monitoring for device changes"""
+    def start_monitoring(self, wait: bool = True):
+        """
+        Start monitoring for device changes
+        
+        Args:
+            wait: Return only once the initial snapshot is available, as get_initial_state()
+                  expects; with False, return at once and use wait_until_ready() later
+        """
         if self.running:
+            if wait:
+                self._wait_for_initial_snapshot()
             return
             
-        # Capture initial device state
-        self.initial_snapshot = self.device_manager.create_snapshot()
-        self.last_snapshot = copy.deepcopy(self.initial_snapshot)
+        self.initial_ready.clear()
+        self.initial_snapshot = None
+        self.last_snapshot = None
+        # Start from the previous run's device list if we can
+        cached_snapshot = self._load_cached_snapshot() if self.warm_start else None
+        if cached_snapshot is not None:
+            self._set_initial_snapshot(cached_snapshot)
+            # The monitor thread's first action is a real discovery
+            self._reconcile_pending = True
         
         self.running = True
+        self._stop_event.clear()
+        self._dispatch_thread = threading.Thread(target=self._dispatch_loop, daemon=True)
+        self._dispatch_thread.start()
         self.thread = self._create_monitor_thread()
         self.thread.start()
+        if wait:
+            self._wait_for_initial_snapshot()
+    
+    def _wait_for_initial_snapshot(self):
+        """Block until the initial snapshot is available or the monitor thread has died"""
+        while not self.initial_ready.wait(0.1):
+            if self.thread is None or not self.thread.is_alive():
+                return
     
     def stop_monitoring(self):
         """Stop monitoring for device changes"""
@@ -262,57 +524,270 @@ class AbstractHotplugMonitor(ABC):
             return
             
         self.running = False
+        self._wake_monitor_thread()
         if self.thread:
             self.thread.join(timeout=5.0)
+        # Events queued before the stop are still delivered, then the dispatcher exits
+        self._event_queue.put(None)
+        if self._dispatch_thread:
+            self._dispatch_thread.join(timeout=5.0)
+            self._dispatch_thread = None
+    
+    def _wake_monitor_thread(self):
+        """Interrupt the monitor thread's wait so it notices running is False"""
+        self._stop_event.set()
+    
+    def _dispatch_loop(self):
+        """Deliver queued change events to the callbacks, in order, until the None sentinel"""
+        while True:
+            event_data = self._event_queue.get()
+            if event_data is None:
+                return
+            # Iterate a copy so a callback may unsubscribe itself
+            for callback in tuple(self.callbacks):
+                try:
+                    callback(event_data)
+                except Exception as e:
+                    print(f"Error in hotplug callback: {e}")
     
     @abstractmethod
     def _create_monitor_thread(self):
         """Create and return the monitoring thread"""
         pass
     
+    def _load_cached_snapshot(self) -> Optional[DeviceSnapshot]:
+        """Load the device list saved by a previous run, if it is recent and for the same VID/PID"""
+        try:
+            if time.time() - os.path.getmtime(self.snapshot_cache_path) > self.snapshot_cache_max_age:
+                return None
+            with open(self.snapshot_cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f, object_hook=_json_object_hook)
+        except (OSError, ValueError, TypeError, AttributeError):
+            return None
+        manager = self.device_manager
+        if (not isinstance(data, dict) or
+                data.get('ids') != [manager.serial_vid, manager.serial_pid, manager.hid_vid, manager.hid_pid]):
+            return None
+        try:
+            devices = [DeviceInfo.from_dict(device) for device in data.get('devices', [])]
+        except Exception:
+            # A cache we can't decode is treated as missing; start_monitoring must not fail on it
+            return None
+        return DeviceSnapshot(devices)
+    
+    def _save_cached_snapshot(self, snapshot: DeviceSnapshot):
+        """Save a snapshot's devices for the next run's warm start; best effort"""
+        manager = self.device_manager
+        data = {
+            'ids': [manager.serial_vid, manager.serial_pid, manager.hid_vid, manager.hid_pid],
+            # platform_specific holds raw enumeration data that only matters to the live run
+            'devices': [{key: value for key, value in device.items() if key != 'platform_specific'}
+                        for device in snapshot.as_dict_list]
+        }
+        cache_dir = os.path.dirname(self.snapshot_cache_path)
+        tmp_path = None
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            # A uniquely named temporary file, so concurrent writers never share one
+            with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=cache_dir, suffix='.tmp',
+                                             delete=False) as f:
+                tmp_path = f.name
+                json.dump(data, f, default=_json_default)
+            # Replace atomically so a concurrent reader never sees a partial file
+            os.replace(tmp_path, self.snapshot_cache_path)
+        except (OSError, TypeError, ValueError):
+            if tmp_path is not None:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+    
+    def _debounce_wait_time(self, deadline: float) -> float:
+        """
+        How long to wait for a follow-up device event before handling a burst
+        
+        Args:
+            deadline: time.monotonic() value at which the burst is handled regardless
+            
+        Returns:
+            Seconds to wait, or 0 once the deadline has passed
+        """
+        return max(0.0, min(self._debounce, deadline - time.monotonic()))
+    
+    def wait_until_ready(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for the initial device snapshot
+        
+        Args:
+            timeout: Maximum time in seconds to wait, or None to wait indefinitely
+            
+        Returns:
+            True if the initial snapshot is available
+        """
+        return self.initial_ready.wait(timeout)
+    
+    def _set_initial_snapshot(self, snapshot: DeviceSnapshot):
+        with self._net_lock:
+            self.initial_snapshot = snapshot
+            # Snapshots are replaced, never mutated, so the initial one can double as the last one
+            self.last_snapshot = snapshot
+            self._net_delta = ({}, {}, {})
+        self.initial_ready.set()
+    
+    def _wait_for_rescan(self) -> bool:
+        """
+        Wait until the monitor thread should take a new snapshot
+        
+        Returns:
+            True if the devices should be re-enumerated
+        """
+        if not self.initial_ready.is_set():
+            # First pass of the monitor thread: take the initial snapshot
+            snapshot = self.device_manager.create_snapshot()
+            if self.warm_start:
+                self._save_cached_snapshot(snapshot)
+            self._set_initial_snapshot(snapshot)
+            return False
+        if self._reconcile_pending:
+            # Started from a cached device list; reconcile it right away
+            self._reconcile_pending = False
+            return True
+        return self._wait_for_device_event(self.poll_interval)
+    
+    @property
+    def uses_device_events(self) -> bool:
+        """Whether the monitor waits on OS device notifications rather than polling"""
+        return False
+    
+    def _wait_for_device_event(self, timeout: float) -> bool:
+        """
+        Wait until devices may have changed or timeout seconds have passed
+        
+        The default implementation polls: it waits out timeout and then asks for a rescan,
+        unless monitoring was stopped meanwhile. Backends with an OS notification source
+        override it and only return True when a relevant device was added or removed.
+        
+        Returns:
+            True if the devices should be re-enumerated
+        """
+        return not self._stop_event.wait(timeout)
+    
     def _handle_device_changes(self, current_snapshot: DeviceSnapshot):
         """Handle detected device changes"""
-        changes = current_snapshot.compare_with(self.last_snapshot)
+        if not self.callbacks and not self.warm_start:
+            # Nobody to notify and nothing to persist, so there is nothing to diff
+            with self._net_lock:
+                self.last_snapshot = current_snapshot
+                self._net_delta = None
+            return
+        
+        # Each snapshot keys its devices once, so the initial snapshot's map is reused for every event
+        current_map = current_snapshot.device_map
+        changes = _diff(current_map, self.last_snapshot.device_map)
         
         # Check if there are any changes
         if (changes['added_devices'] or 
             changes['removed_devices'] or 
             changes['modified_devices']):
             
-            # Compare with initial snapshot
-            initial_changes = current_snapshot.compare_with(self.initial_snapshot)
+            if self.warm_start:
+                self._save_cached_snapshot(current_snapshot)
             
-            # Call registered callbacks
-            for callback in self.callbacks:
-                try:
-                    callback({
-                        'timestamp': current_snapshot.timestamp,
-                        'current_devices': [dev.to_dict() for dev in current_snapshot.devices],
-                        'changes_from_last': {
-                            'added_devices': [dev.to_dict() for dev in changes['added_devices']],
-                            'removed_devices': [dev.to_dict() for dev in changes['removed_devices']],
-                            'modified_devices': changes['modified_devices']
-                        },
-                        'changes_from_initial': {
-                            'added_devices': [dev.to_dict() for dev in initial_changes['added_devices']],
-                            'removed_devices': [dev.to_dict() for dev in initial_changes['removed_devices']],
-                            'modified_devices': initial_changes['modified_devices']
-                        },
-                        'initial_snapshot': self.initial_snapshot,
-                        'current_snapshot': current_snapshot
-                    })
-                except Exception as e:
-                    print(f"Error in hotplug callback: {e}")
+            self._update_net_delta(changes)
+            
+            if self.callbacks:
+                # Changes since the initial snapshot, from the running tally rather than a full diff
+                initial_changes = self.get_net_changes()
+                
+                # Build the event once; every callback gets the same payload
+                event_data = {
+                    'timestamp': current_snapshot.timestamp,
+                    'current_devices': current_snapshot.as_dict_list,
+                    'changes_from_last': {
+                        'added_devices': [dev.as_dict() for dev in changes['added_devices']],
+                        'removed_devices': [dev.as_dict() for dev in changes['removed_devices']],
+                        'modified_devices': changes['modified_devices']
+                    },
+                    'changes_from_initial': {
+                        'added_devices': [dev.as_dict() for dev in initial_changes['added_devices']],
+                        'removed_devices': [dev.as_dict() for dev in initial_changes['removed_devices']],
+                        'modified_devices': initial_changes['modified_devices']
+                    },
+                    'initial_snapshot': self.initial_snapshot,
+                    'current_snapshot': current_snapshot
+                }
+                
+                # The dispatcher thread calls the callbacks; detection carries on meanwhile
+                self._event_queue.put(event_data)
         
         # Update last snapshot
         self.last_snapshot = current_snapshot
     
+    def _update_net_delta(self, changes: Dict[str, List[DeviceInfo]]):
+        """Fold the changes since last_snapshot into the net changes since initial_snapshot"""
+        with self._net_lock:
+            if self._net_delta is None:
+                return
+            added, removed, modified = self._net_delta
+            initial_map = self.initial_snapshot.device_map
+            
+            for dev in changes['removed_devices']:
+                key = dev.get_unique_key()
+                modified.pop(key, None)
+                # Anything we had that wasn't added since the start was there initially
+                if added.pop(key, None) is None:
+                    removed[key] = initial_map[key]
+            
+            for dev in changes['added_devices']:
+                key = dev.get_unique_key()
+                if removed.pop(key, None) is None:
+                    added[key] = dev
+                else:
+                    # Back again; it may have come back with different paths
+                    self._note_net_modified(modified, key, initial_map[key], dev)
+            
+            for change in changes['modified_devices']:
+                new = change['new']
+                key = new.get_unique_key()
+                if key in added:
+                    added[key] = new
+                else:
+                    self._note_net_modified(modified, key, initial_map[key], new)
+    
+    @staticmethod
+    def _note_net_modified(modified: Dict[str, Dict], key: str, initial: DeviceInfo, current: DeviceInfo):
+        if initial._mutable_tuple() != current._mutable_tuple():
+            modified[key] = {'old': initial, 'new': current}
+        else:
+            modified.pop(key, None)
+    
+    def get_net_changes(self) -> Dict[str, List[DeviceInfo]]:
+        """
+        Get the changes between the initial and the latest snapshot
+        
+        Returns:
+            Dictionary in the format of DeviceSnapshot.compare_with
+        """
+        with self._net_lock:
+            if self._net_delta is not None:
+                added, removed, modified = self._net_delta
+                return {
+                    'added_devices': list(added.values()),
+                    'removed_devices': list(removed.values()),
+                    'modified_devices': list(modified.values())
+                }
+            last_snapshot, initial_snapshot = self.last_snapshot, self.initial_snapshot
+        if last_snapshot is None:
+            return {'added_devices': [], 'removed_devices': [], 'modified_devices': []}
+        # Snapshots are never mutated, so the full diff can run outside the lock
+        return last_snapshot.compare_with(initial_snapshot)
+    
     def get_current_state(self):
         """Get current device state"""
         if self.last_snapshot:
             return {
                 'timestamp': self.last_snapshot.timestamp,
-                'devices': [dev.to_dict() for dev in self.last_snapshot.devices],
+                'devices': self.last_snapshot.as_dict_list,
                 'device_count': len(self.last_snapshot.devices)
             }
         return None
@@ -322,7 +797,7 @@ class AbstractHotplugMonitor(ABC):
         if self.initial_snapshot:
             return {
                 'timestamp': self.initial_snapshot.timestamp,
-                'devices': [dev.to_dict() for dev in self.initial_snapshot.devices],
+                'devices': self.initial_snapshot.as_dict_list,
                 'device_count': len(self.initial_snapshot.devices)
             }
         return None
@@ -333,24 +808,29 @@ class DeviceSelector:
     
     def __init__(self, device_manager: AbstractDeviceManager):
         self.device_manager = device_manager
+        # Grouping of the discovery result from cache generation _grouped_generation
+        self._grouped = None
+        self._grouped_generation = None
     
     def list_devices_grouped_by_port_chain(self) -> Dict[str, List[DeviceInfo]]:
         """
         List all devices grouped by their port chain
         
+        The grouping is reused while the manager's discovery result is; don't mutate it.
+        
         Returns:
             Dictionary mapping port chain to list of devices
         """
         all_devices = self.device_manager.discover_devices()
-        grouped = {}
-        
-        for device in all_devices:
-            port_chain = device.port_chain or "unknown"
-            if port_chain not in grouped:
-                grouped[port_chain] = []
-            grouped[port_chain].append(device)
+        generation = self.device_manager.cache_generation
+        if self._grouped is None or self._grouped_generation != generation:
+            grouped = defaultdict(list)
+            for device in all_devices:
+                grouped[device.port_chain or "unknown"].append(device)
+            self._grouped = dict(grouped)
+            self._grouped_generation = generation
             
-        return grouped
+        return self._grouped
     
     def select_device_by_port_chain(self, port_chain: str) -> Optional[DeviceInfo]:
         """
@@ -379,10 +859,7 @@ class DeviceSelector:
             return None
         
         print("Available devices:")
-        port_chains = list(grouped_devices.keys())
-        
-        for i, port_chain in enumerate(port_chains, 1):
-            devices = grouped_devices[port_chain]
+        for i, (port_chain, devices) in enumerate(grouped_devices.items(), 1):
             print(f"{i}. Port Chain: {port_chain}")
             for device in devices:
                 print(f"   {device}")
@@ -391,8 +868,9 @@ class DeviceSelector:
             choice = int(input("Select device by number (0 to cancel): "))
             if choice == 0:
                 return None
-            if 1 <= choice <= len(port_chains):
-                selected_port_chain = port_chains[choice - 1]
+            if 1 <= choice <= len(grouped_devices):
+                # dicts keep insertion order, so the choice indexes the listing above
+                selected_port_chain = list(grouped_devices)[choice - 1]
                 return self.select_device_by_port_chain(selected_port_chain)
             else:
                 print("Invalid selection.")
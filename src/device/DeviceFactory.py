@@ -1,11 +1,43 @@
 """
 Cross-platform device manager factory
 """
+import importlib
 import platform
 from typing import Optional
 from device.AbstractDeviceManager import AbstractDeviceManager, AbstractHotplugMonitor, DeviceSelector
 
-def create_device_manager(serial_vid: str, serial_pid: str, hid_vid: str, hid_pid: str) -> AbstractDeviceManager:
+# The platform can't change while we run, so detect it once
+_SYSTEM = platform.system().lower()
+
+# Backend module, device manager class and hotplug monitor class per platform
+_BACKEND_MODULES = {
+    "windows": ("device.DeviceGroupsWin", "WindowsDeviceManager", "WindowsHotplugMonitor"),
+    "linux": ("device.DeviceGroupsLinux", "LinuxDeviceManager", "LinuxHotplugMonitor"),
+}
+# (DeviceManagerCls, HotplugMonitorCls) per platform, imported on first use
+_BACKENDS = {}
+
+def _load_backend(kind: str):
+    """
+    Return the (device manager, hotplug monitor) classes for the current platform
+    
+    Raises:
+        NotImplementedError: If the current platform is not supported
+    """
+    backend = _BACKENDS.get(_SYSTEM)
+    if backend is None:
+        if _SYSTEM == "darwin":  # macOS
+            # TODO: Implement macOS device manager and hotplug monitor
+            raise NotImplementedError(f"macOS {kind} not yet implemented")
+        if _SYSTEM not in _BACKEND_MODULES:
+            raise NotImplementedError(f"Platform '{_SYSTEM}' is not supported")
+        module_name, manager_name, monitor_name = _BACKEND_MODULES[_SYSTEM]
+        module = importlib.import_module(module_name)
+        backend = _BACKENDS[_SYSTEM] = (getattr(module, manager_name), getattr(module, monitor_name))
+    return backend
+
+def create_device_manager(serial_vid: str, serial_pid: str, hid_vid: str, hid_pid: str,
+                          cache_ttl: float = 0.5) -> AbstractDeviceManager:
     """
     Create a device manager appropriate for the current platform
     
@@ -14,6 +46,7 @@ def create_device_manager(serial_vid: str, serial_pid: str, hid_vid: str, hid_pi
         serial_pid: Product ID for serial devices
         hid_vid: Vendor ID for HID devices
         hid_pid: Product ID for HID devices
+        cache_ttl: Time in seconds a discovery result is reused by discover_devices
         
     Returns:
         Platform-appropriate device manager instance
@@ -21,23 +54,12 @@ def create_device_manager(serial_vid: str, serial_pid: str, hid_vid: str, hid_pi
     Raises:
         NotImplementedError: If the current platform is not supported
     """
-    system = platform.system().lower()
-    
-    if system == "windows":
-        from device.DeviceGroupsWin import WindowsDeviceManager
-        return WindowsDeviceManager(serial_vid, serial_pid, hid_vid, hid_pid)
-    elif system == "linux":
-        from device.DeviceGroupsLinux import LinuxDeviceManager
-        return LinuxDeviceManager(serial_vid, serial_pid, hid_vid, hid_pid)
-    elif system == "darwin":  # macOS
-        # TODO: Implement macOS device manager
-        raise NotImplementedError("macOS device manager not yet implemented")
-    else:
-        raise NotImplementedError(f"Platform '{system}' is not supported")
+    device_manager_cls, _ = _load_backend("device manager")
+    return device_manager_cls(serial_vid, serial_pid, hid_vid, hid_pid, cache_ttl)
 
 
 def create_hotplug_monitor(serial_vid: str, serial_pid: str, hid_vid: str, hid_pid: str, 
-                          poll_interval: float = 2.0) -> AbstractHotplugMonitor:
+                          poll_interval: float = 2.0, warm_start: bool = False) -> AbstractHotplugMonitor:
     """
     Create a hotplug monitor appropriate for the current platform
     
@@ -47,6 +69,7 @@ def create_hotplug_monitor(serial_vid: str, serial_pid: str, hid_vid: str, hid_p
         hid_vid: Vendor ID for HID devices
         hid_pid: Product ID for HID devices
         poll_interval: Time in seconds between device scans
+        warm_start: Start from, and keep saving, the last known device list
         
     Returns:
         Platform-appropriate hotplug monitor instance
@@ -54,21 +77,9 @@ def create_hotplug_monitor(serial_vid: str, serial_pid: str, hid_vid: str, hid_p
     Raises:
         NotImplementedError: If the current platform is not supported
     """
-    system = platform.system().lower()
-    
-    if system == "windows":
-        from device.DeviceGroupsWin import WindowsDeviceManager, WindowsHotplugMonitor
-        device_manager = WindowsDeviceManager(serial_vid, serial_pid, hid_vid, hid_pid)
-        return WindowsHotplugMonitor(device_manager, poll_interval)
-    elif system == "linux":
-        from device.DeviceGroupsLinux import LinuxDeviceManager, LinuxHotplugMonitor
-        device_manager = LinuxDeviceManager(serial_vid, serial_pid, hid_vid, hid_pid)
-        return LinuxHotplugMonitor(device_manager, poll_interval)
-    elif system == "darwin":  # macOS
-        # TODO: Implement macOS hotplug monitor
-        raise NotImplementedError("macOS hotplug monitor not yet implemented")
-    else:
-        raise NotImplementedError(f"Platform '{system}' is not supported")
+    device_manager_cls, hotplug_monitor_cls = _load_backend("hotplug monitor")
+    device_manager = device_manager_cls(serial_vid, serial_pid, hid_vid, hid_pid)
+    return hotplug_monitor_cls(device_manager, poll_interval, warm_start)
 
 
 def create_device_selector(serial_vid: str, serial_pid: str, hid_vid: str, hid_pid: str) -> DeviceSelector:
@@ -113,10 +124,10 @@ def get_supported_platforms():
 def is_platform_supported(platform_name: Optional[str] = None) -> bool:
     """Check if a platform is supported"""
     if platform_name is None:
-        platform_name = platform.system().lower()
+        platform_name = _SYSTEM
     return platform_name in get_supported_platforms()
 
 
 def get_current_platform() -> str:
     """Get the current platform name"""
-    return platform.system().lower()
+    return _SYSTEM
@@ -1,12 +1,15 @@
 import config
 import sys
 import os
+import re
 import time
 from datetime import datetime
 import threading
+import queue
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 from device import DeviceFactory
-from device.AbstractDeviceManager import DeviceSelector
+from device.AbstractDeviceManager import DeviceSelector, DeviceInfo
 from video import VideoFFmpeg
 from serialPort.SerialManager import SerialManager
 from device import VideoHID
@@ -19,6 +22,28 @@ logger.serial_logger.setLevel(30)  # WARNING level
 logger.hid_logger.setLevel(30)  # WARNING level
 logger.ui_logger.setLevel(30)  # WARNING level
 
+_PATH_FIELDS = ('serial_port_path', 'HID_path', 'camera_path', 'audio_path')
+_TRAILING_NUMBER_RE = re.compile(r'\d+$')
+# HID paths are bytes on Linux
+_TRAILING_NUMBER_BYTES_RE = re.compile(rb'\d+$')
+
+def _is_renumbering(old: Dict[str, Any], new: Dict[str, Any]) -> bool:
+    """True if only one path changed, and only in its trailing number (e.g. /dev/ttyUSB3 -> /dev/ttyUSB4)"""
+    changed = [field for field in _PATH_FIELDS if old[field] != new[field]]
+    if len(changed) != 1:
+        return False
+    old_path, new_path = old[changed[0]], new[changed[0]]
+    # A path that is missing on either side is an appearance or disappearance, not a renumbering
+    if not old_path or not new_path or type(old_path) is not type(new_path):
+        return False
+    if isinstance(old_path, str):
+        pattern = _TRAILING_NUMBER_RE
+    elif isinstance(old_path, bytes):
+        pattern = _TRAILING_NUMBER_BYTES_RE
+    else:
+        return False
+    return pattern.sub(old_path[:0], old_path) == pattern.sub(new_path[:0], new_path)
+
 class DeviceGroupDemo:
     """
     Openterface Device Group Demo with Hot-Plug Detection
@@ -27,23 +52,44 @@ class DeviceGroupDemo:
     functionality for Openterface devices.
     """
     
-    def __init__(self):
+    # Device dictionary path field -> subdevice label, in display order
+    _FIELD_MAP = (
+        ('serial_port_path', 'Serial Port'),
+        ('HID_path', 'HID Device'),
+        ('camera_path', 'Camera'),
+        ('audio_path', 'Audio')
+    )
+    
+    def __init__(self) -> None:
         # Device configuration - Openterface VID/PID values
         self.HID_VID = "534D"
         self.HID_PID = "2109"
         self.Serial_port_VID = "1A86"
         self.Serial_port_PID = "7523"
         
-        # Initialize device manager and selector
+        # Initialize device manager and selector. Menus and status checks within
+        # a short window share one enumeration; hotplug events invalidate it.
         self.device_manager = DeviceFactory.create_device_manager(
             self.Serial_port_VID, self.Serial_port_PID, 
-            self.HID_VID, self.HID_PID
+            self.HID_VID, self.HID_PID,
+            cache_ttl=1.5
         )
         self.device_selector = DeviceSelector(self.device_manager)
         self.monitor = None
         self.selected_device_info = None
         self.socket_server = None
         self.running = True
+        # Set when the demo should shut down; the main thread sleeps on it
+        self._stop_event = threading.Event()
+        
+        # Device change reports are printed on our own worker thread so the
+        # monitor's dispatcher is never held up by console output
+        self._evq = queue.Queue(maxsize=256)
+        # Counted by the monitor's dispatcher thread and reported by the worker
+        self._dropped_events = 0
+        self._dropped_lock = threading.Lock()
+        # Started with the monitoring, and again whenever monitoring restarts after a stop
+        self._event_worker = None
         
         print(f"✅ Device Group Demo initialized for {DeviceFactory.get_current_platform()} platform")
         print(f"🔍 Device Configuration:")
@@ -53,57 +99,138 @@ class DeviceGroupDemo:
         # Automatically start hotplug monitoring
         self.start_hotplug_monitoring()
 
-    def format_device_brief(self, device):
-        """Format device info briefly for display"""
-        parts = []
-        if device.get('serial_port_path'):
-            parts.append(f"Serial:{device['serial_port_path']}")
-        if device.get('camera_path'):
-            parts.append(f"Video")
-        if device.get('audio_path'):
-            parts.append(f"Audio")
-        if device.get('HID_path'):
-            parts.append(f"HID")
-        return " | ".join(parts) if parts else "Unknown device"
+    def format_device_brief(self, device: Union[DeviceInfo, Dict[str, Any]]) -> str:
+        """Format device info (a DeviceInfo or its dictionary) briefly for display"""
+        if isinstance(device, DeviceInfo):
+            return device.brief
+        serial_port_path = device.get('serial_port_path')
+        return " | ".join(filter(None, (
+            serial_port_path and f"Serial:{serial_port_path}",
+            device.get('camera_path') and "Video",
+            device.get('audio_path') and "Audio",
+            device.get('HID_path') and "HID"
+        ))) or "Unknown device"
+
+    def _enqueue_event(self, event_data: Dict[str, Any]) -> None:
+        """Monitor callback: hand the event to the worker thread and return immediately"""
+        # The device set changed, so the next lookup must enumerate again
+        self.device_manager.invalidate_cache()
+        socket_server = self.socket_server
+        if socket_server:
+            socket_server.publish_device_change(event_data)
+        try:
+            self._evq.put_nowait(event_data)
+        except queue.Full:
+            with self._dropped_lock:
+                self._dropped_events += 1
+
+    def _consume_events(self) -> None:
+        """Worker thread: report queued device changes as they arrive"""
+        stopping = False
+        while not stopping:
+            event_data = self._evq.get()
+            if event_data is None:
+                break
+            # The monitor already debounces bursts, so don't wait for more; just fold in
+            # events that queued up while the previous report was printing
+            while True:
+                try:
+                    next_event = self._evq.get_nowait()
+                except queue.Empty:
+                    break
+                if next_event is None:
+                    stopping = True
+                    break
+                event_data = self._merge_events(event_data, next_event)
+            try:
+                with self._dropped_lock:
+                    dropped, self._dropped_events = self._dropped_events, 0
+                if dropped:
+                    print(f"⚠️  {dropped} device change event(s) dropped (queue full)")
+                self.device_change_callback(event_data)
+            except Exception as e:
+                print(f"Error reporting device change: {e}")
+
+    @staticmethod
+    def _merge_events(earlier: Dict[str, Any], later: Dict[str, Any]) -> Dict[str, Any]:
+        """Combine two consecutive change events: every step's changes, the later event's state"""
+        merged = dict(later)
+        merged['changes_from_last'] = {
+            kind: earlier['changes_from_last'][kind] + later['changes_from_last'][kind]
+            for kind in ('added_devices', 'removed_devices', 'modified_devices')
+        }
+        return merged
 
-    def device_change_callback(self, event_data):
+    def _emit(self, lines: List[str]) -> None:
+        """Write a block of report lines with a single write"""
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
+
+    def device_change_callback(self, event_data: Dict[str, Any]) -> None:
         """Callback function called when device changes are detected"""
-        print(f"\n🚨 === Device Change Detected at {event_data['timestamp']} ===")
+        lines = [f"\n🚨 === Device Change Detected at {event_data['timestamp']} ==="]
         
         changes_from_last = event_data['changes_from_last']
         changes_from_initial = event_data['changes_from_initial']
         
         # Report changes from last scan
         if changes_from_last['added_devices']:
-            print(f"📱 NEW DEVICES CONNECTED ({len(changes_from_last['added_devices'])}):")
+            lines.append(f"📱 NEW DEVICES CONNECTED ({len(changes_from_last['added_devices'])}):")
             for device in changes_from_last['added_devices']:
-                print(f"  ➕ {self.format_device_brief(device)}")
+                lines.append(f"  ➕ {self.format_device_brief(device)}")
         
         if changes_from_last['removed_devices']:
-            print(f"🔌 DEVICES DISCONNECTED ({len(changes_from_last['removed_devices'])}):")
+            lines.append(f"🔌 DEVICES DISCONNECTED ({len(changes_from_last['removed_devices'])}):")
             for device in changes_from_last['removed_devices']:
-                print(f"  ➖ {self.format_device_brief(device)}")
+                lines.append(f"  ➖ {self.format_device_brief(device)}")
+        
+        # A device node renumbered after a reset is summarized rather than listed as modified
+        modified = []
+        renumbered = 0
+        for change in changes_from_last['modified_devices']:
+            new = change['new']
+            if _is_renumbering(change['old'].as_dict(), new.as_dict()):
+                renumbered += 1
+            else:
+                modified.append(new)
         
-        if changes_from_last['modified_devices']:
-            print(f"🔄 DEVICES MODIFIED ({len(changes_from_last['modified_devices'])}):")
-            for change in changes_from_last['modified_devices']:
-                print(f"  🔀 {self.format_device_brief(change['new'])}")
+        if modified:
+            lines.append(f"🔄 DEVICES MODIFIED ({len(modified)}):")
+            for device in modified:
+                lines.append(f"  🔀 {self.format_device_brief(device)}")
+        
+        if renumbered:
+            lines.append(f"🔢 Device paths renumbered: {renumbered}")
         
         # Report overall state compared to initial
         current_count = len(event_data['current_devices'])
         initial_count = len(event_data['initial_snapshot'].devices)
-        print(f"📊 Total devices: {current_count} (was {initial_count} initially)")
+        lines.append(f"📊 Total devices: {current_count} (was {initial_count} initially)")
         
         if changes_from_initial['added_devices']:
-            print(f"📈 Net new since start: {len(changes_from_initial['added_devices'])}")
+            lines.append(f"📈 Net new since start: {len(changes_from_initial['added_devices'])}")
         
         if changes_from_initial['removed_devices']:
-            print(f"📉 Net removed since start: {len(changes_from_initial['removed_devices'])}")
+            lines.append(f"📉 Net removed since start: {len(changes_from_initial['removed_devices'])}")
         
-        print("=" * 60)
+        lines.append("=" * 60)
+        self._emit(lines)
 
-    def start_hotplug_monitoring(self, poll_interval=2.0):
-        """Start hotplug monitoring"""
+    def start_hotplug_monitoring(self, poll_interval: float = 2.0) -> None:
+        """
+        Start hotplug monitoring
+        
+        Does nothing if monitoring is already running: a restart would cost a full
+        enumeration and replace the initial snapshot that changes are reported against.
+        """
+        if self.monitor and self.monitor.running:
+            return
+        
+        # stop_monitoring ends the worker, so a restart needs a new one
+        if self._event_worker is None or not self._event_worker.is_alive():
+            self._event_worker = threading.Thread(target=self._consume_events, daemon=True)
+            self._event_worker.start()
+        
         print("🔧 Creating Cross-Platform Hotplug Monitor...")
         
         self.monitor = DeviceFactory.create_hotplug_monitor(
@@ -115,53 +242,56 @@ class DeviceGroupDemo:
         )
         
         # Add our callback function
-        self.monitor.add_callback(self.device_change_callback)
+        self.monitor.add_callback(self._enqueue_event)
         
         print("✅ Cross-platform hotplug monitor created and configured!")
-        print(f"⏰ Polling interval: {self.monitor.poll_interval} seconds")
         
-        # Start the monitoring process
+        # Start the monitoring process; the monitor thread enumerates the initial state
         print("🚀 Starting hotplug monitoring...")
-        self.monitor.start_monitoring()
-        
-        # Wait a moment for initial scan to complete
-        time.sleep(1)
+        self.monitor.start_monitoring(wait=False)
+        if self.monitor.uses_device_events:
+            print("⚡ Waiting for OS device notifications (no polling)")
+        else:
+            print(f"⏰ Polling interval: {self.monitor.poll_interval} seconds")
         
-        # Display initial device state
+        # Display initial device state once the first enumeration has finished
+        if not self.monitor.wait_until_ready(timeout=5.0):
+            print("⏳ Initial device scan is still running")
         initial_state = self.monitor.get_initial_state()
         if initial_state:
             print(f"\n📋 Initial Device State (captured at {initial_state['timestamp']}):")
             print(f"   Found {initial_state['device_count']} device(s)")
-            for i, device in enumerate(initial_state['devices'], 1):
-                print(f"   {i}. {self.format_device_brief(device)}")
+            for i, device in enumerate(self.monitor.initial_snapshot.devices, 1):
+                print(f"   {i}. {device.brief}")
         else:
             print("⚠️  No initial devices found matching the specified VID/PID")
         
         print("🟢 Monitoring is now active!")
         print("💡 Connect or disconnect Openterface devices to see changes in real-time")
 
-    def display_device_info(self):
+    def display_device_info(self) -> None:
         """Display detailed device information"""
-        print("\n📱 Current Device Information")
-        print("=" * 60)
+        lines = ["\n📱 Current Device Information", "=" * 60]
         
         current_devices = self.device_manager.discover_devices()
         
         if not current_devices:
-            print("   No devices found")
+            lines.append("   No devices found")
+            self._emit(lines)
             return
         
         for i, device in enumerate(current_devices, 1):
-            device_dict = device.to_dict()
-            print(f"Device {i}:")
-            print(f"   Port Chain: {device_dict.get('port_chain', 'Unknown')}")
-            print(f"   Serial Port: {device_dict.get('serial_port_path', 'Not found')}")
-            print(f"   HID Path: {device_dict.get('HID_path', 'Not found')}")
-            print(f"   Camera: {device_dict.get('camera_path', 'Not found')}")
-            print(f"   Audio: {device_dict.get('audio_path', 'Not found')}")
-            print()
+            device_dict = device.as_dict()
+            lines.append(f"Device {i}:")
+            lines.append(f"   Port Chain: {device_dict.get('port_chain', 'Unknown')}")
+            lines.append(f"   Serial Port: {device_dict.get('serial_port_path', 'Not found')}")
+            lines.append(f"   HID Path: {device_dict.get('HID_path', 'Not found')}")
+            lines.append(f"   Camera: {device_dict.get('camera_path', 'Not found')}")
+            lines.append(f"   Audio: {device_dict.get('audio_path', 'Not found')}")
+            lines.append("")
+        self._emit(lines)
 
-    def display_port_chains(self):
+    def display_port_chains(self) -> None:
         """Display available port chains for device selection"""
         print("\n🎯 Device Selection by Port Chain:")
         print("=" * 60)
@@ -183,27 +313,25 @@ class DeviceGroupDemo:
         else:
             print("   No devices available for selection")
 
-    def select_device_by_port_chain_interactive(self):
-        """Interactive device selection by port chain with subdevice path display"""
+    def select_device_by_port_chain_interactive(self) -> Optional[Tuple[str, List[Dict[str, Any]]]]:
+        """
+        Interactive device selection by port chain with subdevice path display
+        
+        Only reads the monitor's state; selecting a device must not stop or restart monitoring.
+        """
         print("\n🎯 Interactive Device Selection by Port Chain")
         print("=" * 60)
         
-        # Get current available devices
-        current_devices = self.device_manager.discover_devices()
+        # The monitor's latest snapshot is current and keeps its grouping between calls
+        snapshot = self.monitor.last_snapshot if self.monitor and self.monitor.running else None
+        if snapshot is None:
+            snapshot = self.device_manager.create_snapshot(force_refresh=False)
+        grouped_devices: Dict[str, List[Dict[str, Any]]] = snapshot.by_port_chain
         
-        if not current_devices:
+        if not grouped_devices:
             print("❌ No devices found for selection")
             return None
         
-        # Group devices by port chain
-        grouped_devices = {}
-        for device in current_devices:
-            device_dict = device.to_dict()
-            port_chain = device_dict.get('port_chain', 'Unknown')
-            if port_chain not in grouped_devices:
-                grouped_devices[port_chain] = []
-            grouped_devices[port_chain].append(device_dict)
-        
         # Display available port chains
         port_chains = list(grouped_devices.keys())
         print(f"Available Port Chains ({len(port_chains)}):")
@@ -256,65 +384,65 @@ class DeviceGroupDemo:
                 print("\n❌ Selection cancelled by user")
                 return None
 
-    def display_selected_device_details(self, port_chain, devices):
+    def display_selected_device_details(self, port_chain: str, devices: List[Dict[str, Any]]) -> None:
         """Display detailed information about the selected device and all its subdevices"""
-        print(f"\n📋 Selected Device Details")
-        print("=" * 60)
-        print(f"🔗 Port Chain: {port_chain}")
-        print(f"📊 Total Subdevices: {len(devices)}")
-        print()
-        
-        # Organize subdevices by type
-        subdevice_paths = {
-            'Serial Port': [],
-            'HID Device': [],
-            'Camera': [],
-            'Audio': []
-        }
-        
-        # Collect all paths from all devices in this port chain
+        lines = [
+            "\n📋 Selected Device Details",
+            "=" * 60,
+            f"🔗 Port Chain: {port_chain}",
+            f"📊 Total Subdevices: {len(devices)}",
+            ""
+        ]
+        
+        # Organize subdevices by type, collecting all paths from all devices in this port chain
+        subdevice_paths = {label: [] for _, label in self._FIELD_MAP}
         for device in devices:
-            if device.get('serial_port_path'):
-                subdevice_paths['Serial Port'].append(device['serial_port_path'])
-            if device.get('HID_path'):
-                subdevice_paths['HID Device'].append(device['HID_path'])
-            if device.get('camera_path'):
-                subdevice_paths['Camera'].append(device['camera_path'])
-            if device.get('audio_path'):
-                subdevice_paths['Audio'].append(device['audio_path'])
+            for field, label in self._FIELD_MAP:
+                path = device.get(field)
+                if path:
+                    subdevice_paths[label].append(path)
         
         # Display organized subdevice information
-        print("📱 Subdevice Paths:")
+        lines.append("📱 Subdevice Paths:")
         for device_type, paths in subdevice_paths.items():
             if paths:
-                print(f"\n  🔸 {device_type}:")
+                lines.append(f"\n  🔸 {device_type}:")
                 for i, path in enumerate(paths, 1):
-                    print(f"    {i}. {path}")
+                    lines.append(f"    {i}. {path}")
             else:
-                print(f"\n  🔸 {device_type}: Not available")
+                lines.append(f"\n  🔸 {device_type}: Not available")
         
         # Display detailed device information
-        print(f"\n📝 Detailed Device Information:")
+        lines.append(f"\n📝 Detailed Device Information:")
         for i, device in enumerate(devices, 1):
-            print(f"\n  Device {i}:")
-            print(f"    Serial Port ID: {device.get('serial_port', 'N/A')}")
-            print(f"    Serial Port Path: {device.get('serial_port_path', 'N/A')}")
-            print(f"    HID ID: {device.get('HID', 'N/A')}")
-            print(f"    HID Path: {device.get('HID_path', 'N/A')}")
-            print(f"    Camera ID: {device.get('camera', 'N/A')}")
-            print(f"    Camera Path: {device.get('camera_path', 'N/A')}")
-            print(f"    Audio ID: {device.get('audio', 'N/A')}")
-            print(f"    Audio Path: {device.get('audio_path', 'N/A')}")
-        
-        print("=" * 60)
-        print("✅ Device selection completed!")
-        print("🌐 Socket server will start for device control...")
+            lines.append(f"\n  Device {i}:")
+            lines.append(f"    Serial Port ID: {device.get('serial_port', 'N/A')}")
+            lines.append(f"    Serial Port Path: {device.get('serial_port_path', 'N/A')}")
+            lines.append(f"    HID ID: {device.get('HID', 'N/A')}")
+            lines.append(f"    HID Path: {device.get('HID_path', 'N/A')}")
+            lines.append(f"    Camera ID: {device.get('camera', 'N/A')}")
+            lines.append(f"    Camera Path: {device.get('camera_path', 'N/A')}")
+            lines.append(f"    Audio ID: {device.get('audio', 'N/A')}")
+            lines.append(f"    Audio Path: {device.get('audio_path', 'N/A')}")
+        
+        lines.append("=" * 60)
+        lines.append("✅ Device selection completed!")
+        lines.append("🌐 Socket server will start for device control...")
+        self._emit(lines)
 
-    def start_socket_server(self, host='localhost', port=8888):
-        """Start socket server for device control using DeviceSocketServer"""
+    def start_socket_server(self, host: str = 'localhost', port: int = 8888) -> None:
+        """
+        Start socket server for device control using DeviceSocketServer
+        
+        Does nothing if the server is already running. Leaves the hotplug monitor alone.
+        """
+        if self.socket_server and self.socket_server.running:
+            return
+        
         try:
             # Pass device manager instead of selected device info
-            self.socket_server = DeviceSocketServer(self.device_manager, host, port)
+            self.socket_server = DeviceSocketServer(self.device_manager, host, port,
+                                                    stop_event=self._stop_event)
             success = self.socket_server.start_server()
             
             if success:
@@ -322,36 +450,31 @@ class DeviceGroupDemo:
                 print("📋 Clients can now discover and select devices via socket commands")
             else:
                 print("❌ Failed to start socket server")
+                self.socket_server = None
                 
         except Exception as e:
             print(f"❌ Failed to create socket server: {e}")
 
-    def stop_socket_server(self):
+    def stop_socket_server(self) -> None:
         """Stop the socket server"""
         if self.socket_server:
             self.socket_server.stop_server()
             self.socket_server = None
+        self._stop_event.set()
 
     # ...existing code...
 
-    def get_port_chains_during_monitoring(self):
+    def get_port_chains_during_monitoring(self) -> List[str]:
         """Get available port chains during active monitoring"""
         if not self.monitor:
             print("⚠️  Monitor not initialized")
             return []
         
         current_devices = self.device_manager.discover_devices()
-        port_chains = []
-        
-        for device in current_devices:
-            device_dict = device.to_dict()
-            port_chain = device_dict.get('port_chain', 'Unknown')
-            if port_chain not in port_chains:
-                port_chains.append(port_chain)
-        
-        return port_chains
+        # dict.fromkeys drops duplicates in linear time and keeps discovery order
+        return list(dict.fromkeys(device.as_dict().get('port_chain', 'Unknown') for device in current_devices))
 
-    def get_monitoring_status(self):
+    def get_monitoring_status(self) -> None:
         """Check current monitoring status"""
         if not self.monitor:
             print("⚠️  Monitor not initialized")
@@ -365,9 +488,8 @@ class DeviceGroupDemo:
             print(f"   Initial devices: {initial_state['device_count']} (at {initial_state['timestamp']})")
             print(f"   Current devices: {current_state['device_count']} (at {current_state['timestamp']})")
             
-            # Compare current with initial
-            current_snapshot = self.monitor.device_manager.create_snapshot()
-            changes = current_snapshot.compare_with(self.monitor.initial_snapshot)
+            # Net changes since start, as tracked by the monitor
+            changes = self.monitor.get_net_changes()
             
             if changes['added_devices'] or changes['removed_devices']:
                 print(f"\n🔄 Changes since start:")
@@ -380,14 +502,18 @@ class DeviceGroupDemo:
                 
             print(f"\n🏃‍♂️ Monitor is {'running' if self.monitor.running else 'stopped'}")
 
-    def stop_monitoring(self):
+    def stop_monitoring(self) -> None:
         """Stop monitoring and display summary"""
         if not self.monitor:
             print("⚠️  No monitor to stop")
             return
             
+        self._stop_event.set()
         print("🛑 Stopping cross-platform hotplug monitoring...")
         self.monitor.stop_monitoring()
+        if self._event_worker is not None:
+            self._evq.put(None)
+            self._event_worker.join(timeout=5.0)
         print("✅ Monitoring stopped successfully!")
         
         # Display final summary
@@ -400,9 +526,8 @@ class DeviceGroupDemo:
             print(f"   Initial device count: {initial_state['device_count']}")
             print(f"   Final device count: {final_state['device_count']}")
             
-            # Calculate final changes
-            final_snapshot = self.monitor.device_manager.create_snapshot()
-            final_changes = final_snapshot.compare_with(self.monitor.initial_snapshot)
+            # Net changes over the whole run, as tracked by the monitor
+            final_changes = self.monitor.get_net_changes()
             
             if final_changes['added_devices'] or final_changes['removed_devices']:
                 print(f"   Net changes:")
@@ -422,21 +547,20 @@ if __name__ == "__main__":
     demo = DeviceGroupDemo()
     
     try:
-        # Wait for devices to be detected
-        time.sleep(2)
-        
         # Start socket server immediately - clients will discover and select devices
         print("\n� Starting socket server for client device control...")
         demo.start_socket_server()
         
         if demo.socket_server:
             print("\n📡 Socket server is running. Clients can discover and select devices.")
-            print("� Available client commands: discover, select, serial, camera, hid, status")
+            print("� Available client commands: discover, select, serial, camera, hid, status, subscribe")
             print("⏹️  Press Ctrl+C to stop")
             
-            # Keep the program running
-            while demo.running and (not demo.socket_server or demo.socket_server.running):
-                time.sleep(1)
+            # Sleep until the server is stopped (by a client's stop command) or we are.
+            # Windows only delivers Ctrl+C between waits, so wake up periodically there.
+            wait_timeout = 1.0 if DeviceFactory.get_current_platform() == "windows" else None
+            while not demo._stop_event.wait(wait_timeout):
+                pass
         else:
             print("⚠️  Failed to start socket server. Exiting...")
             
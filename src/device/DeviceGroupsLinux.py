@@ -1,23 +1,94 @@
-import pyudev
-import serial.tools.list_ports
-import hid
+import logging
 import threading
 import time
 import os
-import glob
-import subprocess
+import re
+from functools import lru_cache
+from operator import itemgetter
+from collections import defaultdict, namedtuple
 from datetime import datetime
-from typing import List, Any, Dict, Optional
+from typing import List, Any, Callable, Dict, Optional, Tuple
 from utils import logger
-from video import VideoFFmpeg
 from device.AbstractDeviceManager import AbstractDeviceManager, AbstractHotplugMonitor, DeviceInfo, DeviceSnapshot
-import copy
 
 CoreLogger = logger.core_logger
 
-def find_usb_devices_with_vid_pid(vid: str, pid: str) -> List[Dict]:
-    """Find USB devices with specific VID/PID using pyudev"""
-    context = pyudev.Context()
+# Subsystems whose uevents can change what discover_devices reports
+HOTPLUG_SUBSYSTEMS = ('usb', 'tty', 'hidraw', 'video4linux', 'sound')
+# uevent actions that add, remove or alter device nodes; bind/unbind follow an add/remove anyway
+HOTPLUG_ACTIONS = frozenset(('add', 'remove', 'change'))
+
+# Subsystems whose device nodes discovery matches to a port chain
+INDEXED_SUBSYSTEMS = ('tty', 'video4linux', 'sound')
+
+# DEVPATH components that make up a port chain: the "usbN" root hub and every
+# component holding both '-' and '.', such as the hub port "1-2.1"
+_DEVPATH_PORT_RE = re.compile(r'(?<![^/])(?:usb[^/]*|[^/]*(?:-[^/]*\.|\.[^/]*-)[^/]*)(?![^/])')
+# Port chain from build_linux_port_chain: "usb1-1-5.1" -> ("1", "5.1"). Behind a
+# second hub every level is listed, "usb1-1-5.1-1-5.1.2" -> ("1", "5.1.2")
+_PORT_CHAIN_RE = re.compile(r'usb\d+-(\d+)-(?:\d+(?:\.\d+)*-\d+-)*(\d+(?:\.\d+)*)')
+# USB device a sysfs DEVPATH sits under: "/devices/.../usb1/1-5/1-5.1/1-5.1:1.0/tty/ttyACM0"
+# -> "/devices/.../usb1/1-5/1-5.1"
+_USB_DEVPATH_RE = re.compile(r'/devices/.*?/usb\d+(?:/\d+-\d+(?:\.\d+)*)+(?![^/])')
+
+# /proc/asound/cards: " 1 [Device         ]: USB-Audio - USB Audio Device"
+ALSA_CARD_RE = re.compile(r'^\s*(\d+) \[(.*?)\s*\]: (\S+) - (.*)$', re.MULTILINE)
+# /proc/asound/pcm: "01-00: USB Audio : USB Audio : playback 1 : capture 1"
+ALSA_PCM_RE = re.compile(r'^(\d+)-(\d+): (.*?) : (.*?)((?: : (?:playback|capture) \d+)*)$', re.MULTILINE)
+
+# pyudev, hid and serial.tools.list_ports load libudev/hidapi and are imported where they
+# are used, so importing this module stays cheap and works where they are not installed
+
+# A libudev context must not be used by two threads at once, so each thread keeps its own.
+# The thread's current enumeration pass, if any, lives here too: a dict of the
+# comports()/hid.enumerate() results listed so far in that pass.
+_tls = threading.local()
+
+def get_udev_context() -> 'pyudev.Context':
+    """Return this thread's pyudev context, creating it on first use"""
+    context = getattr(_tls, 'udev_context', None)
+    if context is None:
+        import pyudev
+        context = _tls.udev_context = pyudev.Context()
+    return context
+
+def start_enumeration_pass():
+    """Start sharing comports()/hid.enumerate() results among this thread's helpers"""
+    _tls.enum_pass = {}
+
+def end_enumeration_pass():
+    """Stop sharing; helpers called outside a pass enumerate afresh every time"""
+    _tls.enum_pass = None
+
+def _cached_enumeration(name: str, enumerate_devices: Callable[[], Any]) -> List[Any]:
+    """Result of enumerate_devices, listed once per enumeration pass"""
+    enum_pass = getattr(_tls, 'enum_pass', None)
+    if enum_pass is None:
+        return list(enumerate_devices())
+    devices = enum_pass.get(name)
+    if devices is None:
+        devices = enum_pass[name] = list(enumerate_devices())
+    return devices
+
+def cached_comports() -> List[Any]:
+    """serial.tools.list_ports.comports(), shared within one enumeration pass"""
+    import serial.tools.list_ports
+    return _cached_enumeration('comports', serial.tools.list_ports.comports)
+
+def cached_hid_enumerate() -> List[Dict]:
+    """hid.enumerate(), shared within one enumeration pass"""
+    import hid
+    return _cached_enumeration('hid', hid.enumerate)
+
+def find_usb_devices_with_vid_pid(vid: str, pid: str, with_relations: bool = False) -> List[Dict]:
+    """
+    Find USB devices with specific VID/PID using pyudev
+    
+    Args:
+        with_relations: Also list each device's "siblings" and "children", which walks its
+            whole udev subtree; otherwise both are left empty
+    """
+    context = get_udev_context()
     result = []
     
     # Find USB devices with matching VID/PID
@@ -31,8 +102,10 @@ def find_usb_devices_with_vid_pid(vid: str, pid: str) -> List[Dict]:
             port_chain = build_linux_port_chain(devpath)
             
             # Find related devices (children and siblings)
-            children = find_child_devices(device)
-            siblings = find_sibling_devices(device)
+            if with_relations:
+                siblings, children = _collect_family(device)
+            else:
+                siblings, children = [], []
             
             result.append({
                 "port_chain": [port_chain],
@@ -50,315 +123,466 @@ def find_usb_devices_with_vid_pid(vid: str, pid: str) -> List[Dict]:
     
     return result
 
+# The result depends on the DEVPATH string alone, so cached entries never go stale across
+# hotplug events; a re-plugged device simply hits its old entry again
+@lru_cache(maxsize=4096)
 def build_linux_port_chain(devpath: str) -> str:
     """Build a readable port chain from Linux device path"""
     if not devpath:
         return ""
     
     # Extract port information from devpath
-    # Example: /devices/pci0000:00/0000:00:14.0/usb1/1-2/1-2.1
-    parts = devpath.split('/')
-    port_parts = []
-    
-    for part in parts:
-        if part.startswith('usb'):
-            # USB bus number
-            bus_num = part[3:]
-            port_parts.append(f"usb{bus_num}")
-        elif '-' in part and '.' in part:
-            # Port chain like 1-2.1
-            port_parts.append(part)
+    # Example: /devices/pci0000:00/0000:00:14.0/usb1/1-2/1-2.1 -> usb1-1-2.1
+    port_parts = _DEVPATH_PORT_RE.findall(devpath)
     
     return "-".join(port_parts) if port_parts else devpath
 
-def find_child_devices(parent_device) -> List[Dict]:
-    """Find child devices of a USB device"""
-    children = []
+class PortChain(namedtuple('PortChain', 'bus ports')):
+    """Parsed port chain: the USB bus number and the tuple of hub ports below the root hub"""
+    __slots__ = ()
     
-    for child in parent_device.children:
-        # Get device info
-        device_info = {
-            "hardware_id": child.get('ID_MODEL', 'Unknown'),
-            "device_id": child.device_path,
-            "subsystem": child.subsystem,
-            "devtype": child.get('DEVTYPE', ''),
-            "vendor_id": child.get('ID_VENDOR_ID', ''),
-            "product_id": child.get('ID_MODEL_ID', '')
-        }
-        children.append(device_info)
-        
-        # Recursively find grandchildren
-        grandchildren = find_child_devices(child)
-        children.extend(grandchildren)
+    def __str__(self) -> str:
+        return f"usb{self.bus}-{self.bus}-{'.'.join(map(str, self.ports))}"
     
+    def same_main_port(self, other: 'PortChain') -> bool:
+        """Whether both chains hang off the same root hub port (e.g. 1-5 for 1-5.1 and 1-5.2)"""
+        return self.bus == other.bus and self.ports[0] == other.ports[0]
+
+@lru_cache(maxsize=1024)
+def parse_port_chain(port_chain: str) -> Optional[PortChain]:
+    """Parse a port chain from build_linux_port_chain, or None if it is not of the usbB-B-P.P form"""
+    match = _PORT_CHAIN_RE.fullmatch(port_chain)
+    if match is None:
+        return None
+    return PortChain(int(match.group(1)), tuple(map(int, match.group(2).split('.'))))
+
+@lru_cache(maxsize=1024)
+def get_main_port(port_chain: str) -> str:
+    """Main port of a port chain (e.g., 'usb1-1-5.1' -> '1-5'), or "" if it does not parse"""
+    parsed = parse_port_chain(port_chain)
+    return f"{parsed.bus}-{parsed.ports[0]}" if parsed is not None else ""
+
+def same_main_port(port_chain: str, other_port_chain: str) -> bool:
+    """Whether two port chains share a main port; chains that do not parse match nothing"""
+    parsed = parse_port_chain(port_chain)
+    other_parsed = parse_port_chain(other_port_chain)
+    if parsed is None or other_parsed is None:
+        return False
+    return parsed.same_main_port(other_parsed)
+
+def _relation_info(device) -> Dict:
+    """Summary of a related device, as listed under children and siblings"""
+    return {
+        "hardware_id": device.get('ID_MODEL', 'Unknown'),
+        "device_id": device.device_path,
+        "subsystem": device.subsystem,
+        "devtype": device.get('DEVTYPE', ''),
+        "vendor_id": device.get('ID_VENDOR_ID', ''),
+        "product_id": device.get('ID_MODEL_ID', '')
+    }
+
+def _subtree_info(family: List[Tuple[str, Dict]], sys_path: str) -> List[Dict]:
+    """
+    Children of the device at sys_path, each followed by its own children
+    
+    Args:
+        family: (sys_path, info) pairs of an enumerated subtree that contains the device's
+    """
+    # pyudev's Device.children yields every descendant, not just direct ones; this keeps
+    # the listing find_child_devices produced when it recursed through udev
+    prefix = sys_path + '/'
+    children = []
+    for member_path, info in family:
+        if member_path.startswith(prefix):
+            children.append(info)
+            children.extend(_subtree_info(family, member_path))
     return children
 
+def _collect_family(device) -> Tuple[List[Dict], List[Dict]]:
+    """Siblings and children of a device from a single udev enumeration"""
+    parent = device.parent
+    # Everything below the parent includes everything below the device itself
+    family = [(member.sys_path, _relation_info(member)) for member in (parent or device).children]
+    if parent:
+        siblings = [info for member_path, info in family if member_path != device.sys_path]
+    else:
+        siblings = []
+    return siblings, _subtree_info(family, device.sys_path)
+
+def find_child_devices(parent_device) -> List[Dict]:
+    """Find child devices of a USB device"""
+    family = [(child.sys_path, _relation_info(child)) for child in parent_device.children]
+    return _subtree_info(family, parent_device.sys_path)
+
 def find_sibling_devices(device) -> List[Dict]:
     """Find sibling devices (devices with same parent)"""
-    siblings = []
-    
-    if device.parent:
-        for sibling in device.parent.children:
-            if sibling != device:
-                device_info = {
-                    "hardware_id": sibling.get('ID_MODEL', 'Unknown'),
-                    "device_id": sibling.device_path,
-                    "subsystem": sibling.subsystem,
-                    "devtype": sibling.get('DEVTYPE', ''),
-                    "vendor_id": sibling.get('ID_VENDOR_ID', ''),
-                    "product_id": sibling.get('ID_MODEL_ID', '')
-                }
-                siblings.append(device_info)
+    return _collect_family(device)[0]
+
+def build_usb_ancestor_index(context) -> Dict[str, str]:
+    """Map the sys_path of every USB device to its port chain, in one udev pass"""
+    return {device.sys_path: build_linux_port_chain(device.get('DEVPATH', ''))
+            for device in context.list_devices(subsystem='usb', DEVTYPE='usb_device')}
+
+def nearest_ancestor(sys_path: str, by_sys_path: Dict[str, Any]) -> Any:
+    """Value of the closest strict ancestor of sys_path found in by_sys_path, or None"""
+    # Ancestors are path prefixes in sysfs, so trimming the path finds them without
+    # asking libudev for each parent device
+    path = os.path.dirname(sys_path)
+    while path and path != '/':
+        value = by_sys_path.get(path)
+        if value is not None:
+            return value
+        path = os.path.dirname(path)
+    return None
+
+def usb_port_chain_of(device, ancestors: Dict[str, str]) -> Optional[str]:
+    """Port chain of the nearest USB device above a udev device, or None if it is not on USB"""
+    return nearest_ancestor(device.sys_path, ancestors)
+
+def index_nodes_by_port_chain(context, subsystem: str,
+                              ancestors: Optional[Dict[str, str]] = None) -> Dict[str, List[str]]:
+    """
+    Map each USB port chain to the device nodes of a subsystem below it, in one udev pass
     
-    return siblings
+    Args:
+        ancestors: USB device index from build_usb_ancestor_index; built here when omitted
+    """
+    if ancestors is None:
+        ancestors = build_usb_ancestor_index(context)
+    index = {}
+    for device in context.list_devices(subsystem=subsystem):
+        device_node = device.device_node
+        if not device_node:
+            continue
+        port_chain = usb_port_chain_of(device, ancestors)
+        if port_chain is not None:
+            index.setdefault(port_chain, []).append(device_node)
+    return index
 
-def find_serial_ports_by_port_chain(serial_vid: str, serial_pid: str, target_port_chain: str) -> List[Dict]:
-    """Find serial ports by VID/PID and match them to a specific port chain (flexible matching)"""
-    context = pyudev.Context()
+def build_udev_index(context=None) -> Dict[str, Dict[str, List[str]]]:
+    """Port-chain indexes of every subsystem in INDEXED_SUBSYSTEMS, from one udev enumeration"""
+    if context is None:
+        context = get_udev_context()
+    
+    # libudev ORs subsystem matches together, so a single enumeration covers the USB
+    # devices and every indexed subsystem; the USB devices are then told apart by DEVTYPE
+    enumerator = context.list_devices()
+    for subsystem in ('usb',) + INDEXED_SUBSYSTEMS:
+        enumerator = enumerator.match_subsystem(subsystem)
+    
+    ancestors = {}
+    members = []
+    for device in enumerator:
+        if device.subsystem == 'usb':
+            if device.get('DEVTYPE') == 'usb_device':
+                ancestors[device.sys_path] = build_linux_port_chain(device.get('DEVPATH', ''))
+        else:
+            device_node = device.device_node
+            if device_node:
+                members.append((device, device_node))
+    
+    # Classify only after the walk: a node can be listed before the USB device above it
+    index = {subsystem: {} for subsystem in INDEXED_SUBSYSTEMS}
+    for device, device_node in members:
+        port_chain = usb_port_chain_of(device, ancestors)
+        if port_chain is not None:
+            index[device.subsystem].setdefault(port_chain, []).append(device_node)
+    return index
+
+def vid_pid_key(vid: int, pid: int) -> int:
+    """Pack an integer VID/PID pair into the single int the VID/PID indexes are keyed by"""
+    return (vid << 16) | pid
+
+def index_serial_ports_by_vid_pid(serial_ports: Optional[List[Any]] = None) -> Dict[int, List[Any]]:
+    """
+    Group the entries of one comports() call by vid_pid_key(vid, pid)
+    
+    Args:
+        serial_ports: serial.tools.list_ports.comports() result to index; listed here when omitted
+    """
+    if serial_ports is None:
+        import serial.tools.list_ports
+        serial_ports = serial.tools.list_ports.comports()
+    index = defaultdict(list)
+    for port in serial_ports:
+        # Non-USB ports report no VID/PID and can never match
+        if port.vid is not None and port.pid is not None:
+            index[vid_pid_key(port.vid, port.pid)].append(port)
+    return index
+
+def find_serial_ports_by_port_chain(serial_vid: str, serial_pid: str, target_port_chain: str,
+                                    index: Optional[Dict[str, List[str]]] = None,
+                                    serial_index: Optional[Dict[int, List[Any]]] = None) -> List[Dict]:
+    """
+    Find serial ports by VID/PID and match them to a specific port chain (flexible matching)
+    
+    Args:
+        index: tty nodes by port chain from index_nodes_by_port_chain; built here when omitted
+        serial_index: serial ports from index_serial_ports_by_vid_pid; listed here when omitted
+    """
     matching_ports = []
     
     # Extract the main port part from target_port_chain (e.g., "usb1-1-5.1" -> "1-5")
-    target_port_main = ""
-    if '-' in target_port_chain:
-        parts = target_port_chain.split('-')
-        if len(parts) >= 3:  # usb1-1-5.1 -> ["usb1", "1", "5.1"]
-            # Get the main port part (1-5 from 1-5.1)
-            main_part = parts[2].split('.')[0]  # "5.1" -> "5"
-            target_port_main = f"{parts[1]}-{main_part}"  # "1-5"
-    
-    CoreLogger.debug(f"Looking for serial ports on main port: {target_port_main}")
-    
-    # Check all serial ports and see if they match the main port chain
-    serial_ports = list(serial.tools.list_ports.comports())
-    for port in serial_ports:
-        if port.vid and port.pid:
-            port_vid = f"{port.vid:04x}"
-            port_pid = f"{port.pid:04x}"
-            
-            # Check if this port's VID/PID matches our target
-            if port_vid.lower() == serial_vid.lower() and port_pid.lower() == serial_pid.lower():
-                CoreLogger.debug(f"Found matching VID/PID serial port: {port.device}")
-                
-                # Try to find the USB device path for this serial port
-                try:
-                    # Look for the USB device this serial port belongs to
-                    for device in context.list_devices(subsystem='tty'):
-                        if device.device_node == port.device:
-                            # Traverse up to find the USB parent
-                            current = device
-                            while current.parent:
-                                if current.parent.subsystem == 'usb' and current.parent.get('DEVTYPE') == 'usb_device':
-                                    usb_device = current.parent
-                                    devpath = usb_device.get('DEVPATH', '')
-                                    port_chain = build_linux_port_chain(devpath)
-                                    
-                                    CoreLogger.debug(f"Serial port {port.device} found on port chain: {port_chain}")
-                                    
-                                    # Extract main port from this port chain for comparison
-                                    port_main = ""
-                                    if '-' in port_chain:
-                                        parts = port_chain.split('-')
-                                        if len(parts) >= 3:
-                                            main_part = parts[2].split('.')[0]
-                                            port_main = f"{parts[1]}-{main_part}"
-                                    
-                                    # Match on the main port (e.g., "1-5" matches "1-5")
-                                    if port_main == target_port_main:
-                                        CoreLogger.info(f"Serial port {port.device} matches main port {target_port_main}")
-                                        matching_ports.append({
-                                            "device": port.device,
-                                            "name": port.name,
-                                            "description": port.description,
-                                            "hwid": port.hwid,
-                                            "vid": port_vid,
-                                            "pid": port_pid,
-                                            "serial_number": port.serial_number,
-                                            "location": port.location,
-                                            "manufacturer": port.manufacturer,
-                                            "product": port.product,
-                                            "port_chain": port_chain
-                                        })
-                                    break
-                                current = current.parent
-                            break
-                except Exception as e:
-                    CoreLogger.debug(f"Error finding USB parent for serial port {port.device}: {e}")
-                    continue
+    target_port_main = get_main_port(target_port_chain)
+    
+    CoreLogger.debug("Looking for serial ports on main port: %s", target_port_main)
+    
+    # comports() reports VID/PID as integers; parse ours once instead of formatting every port's
+    serial_vid_i = int(serial_vid, 16)
+    serial_pid_i = int(serial_pid, 16)
+    port_vid = serial_vid.lower()
+    port_pid = serial_pid.lower()
+    
+    # Port chain of every USB tty node, from one udev pass rather than one per serial port
+    try:
+        if index is None:
+            index = index_nodes_by_port_chain(get_udev_context(), 'tty')
+        port_chain_by_node = {node: port_chain for port_chain, nodes in index.items() for node in nodes}
+    except Exception as e:
+        CoreLogger.debug("Error indexing tty devices by port chain: %s", e)
+        port_chain_by_node = {}
+    
+    # Serial ports with our VID/PID, looked up once for both matching strategies below
+    if serial_index is None:
+        serial_index = index_serial_ports_by_vid_pid()
+    vid_pid_ports = serial_index.get(vid_pid_key(serial_vid_i, serial_pid_i), ())
+    
+    # Check the matching serial ports and see if they sit on the main port chain
+    for port in vid_pid_ports:
+        CoreLogger.debug("Found matching VID/PID serial port: %s", port.device)
+        
+        # Look up the USB device this serial port belongs to
+        port_chain = port_chain_by_node.get(port.device)
+        if port_chain is None:
+            continue
+        
+        CoreLogger.debug("Serial port %s found on port chain: %s", port.device, port_chain)
+        
+        # Match on the main port (e.g., "1-5" matches "1-5")
+        if same_main_port(port_chain, target_port_chain):
+            CoreLogger.info("Serial port %s matches main port %s", port.device, target_port_main)
+            matching_ports.append(_serial_port_info(port, port_vid, port_pid, port_chain))
     
     # If still no match, try a more flexible approach using location/hwid
     if not matching_ports and target_port_main:
-        CoreLogger.debug(f"No direct match found, trying flexible matching for {target_port_main}")
+        CoreLogger.debug("No direct match found, trying flexible matching for %s", target_port_main)
         
-        for port in serial_ports:
-            if port.vid and port.pid:
-                port_vid = f"{port.vid:04x}"
-                port_pid = f"{port.pid:04x}"
-                
-                if port_vid.lower() == serial_vid.lower() and port_pid.lower() == serial_pid.lower():
-                    # Check if the port location or hwid contains our target port info
-                    port_location = port.location or ""
-                    port_hwid = port.hwid or ""
-                    
-                    # Look for the main port pattern in location/hwid
-                    if target_port_main in port_location or target_port_main in port_hwid:
-                        CoreLogger.info(f"Serial port {port.device} matched via location/hwid for port {target_port_main}")
-                        matching_ports.append({
-                            "device": port.device,
-                            "name": port.name,
-                            "description": port.description,
-                            "hwid": port.hwid,
-                            "vid": port_vid,
-                            "pid": port_pid,
-                            "serial_number": port.serial_number,
-                            "location": port.location,
-                            "manufacturer": port.manufacturer,
-                            "product": port.product,
-                            "port_chain": target_port_chain
-                        })
+        for port in vid_pid_ports:
+            # Look for the main port pattern in location/hwid
+            if target_port_main in (port.location or "") or target_port_main in (port.hwid or ""):
+                CoreLogger.info("Serial port %s matched via location/hwid for port %s", port.device, target_port_main)
+                matching_ports.append(_serial_port_info(port, port_vid, port_pid, target_port_chain))
     
     return matching_ports
 
-def find_hid_devices_by_port_chain(hid_vid: str, hid_pid: str, target_port_chain: str) -> List[Dict]:
-    """Find HID devices by VID/PID and match them to a specific port chain"""
+def _serial_port_info(port, vid: str, pid: str, port_chain: str) -> Dict:
+    """Describe a comports() entry the way the serial finders report it"""
+    return {
+        "device": port.device,
+        "name": port.name,
+        "description": port.description,
+        "hwid": port.hwid,
+        "vid": vid,
+        "pid": pid,
+        "serial_number": port.serial_number,
+        "location": port.location,
+        "manufacturer": port.manufacturer,
+        "product": port.product,
+        "port_chain": port_chain
+    }
+
+def index_hid_devices_by_vid_pid(hid_devices: Optional[List[Dict]] = None) -> Dict[int, List[Dict]]:
+    """
+    Group the entries of one hid.enumerate() call by vid_pid_key(vendor_id, product_id)
+    
+    Args:
+        hid_devices: hid.enumerate() result to index; enumerated here when omitted
+    """
+    if hid_devices is None:
+        import hid
+        hid_devices = hid.enumerate()
+    index = defaultdict(list)
+    for hid_device in hid_devices:
+        index[vid_pid_key(hid_device['vendor_id'], hid_device['product_id'])].append(hid_device)
+    return index
+
+def find_hid_devices_by_port_chain(hid_vid: str, hid_pid: str, target_port_chain: str,
+                                   index: Optional[Dict[int, List[Dict]]] = None) -> List[Dict]:
+    """
+    Find HID devices by VID/PID and match them to a specific port chain
+    
+    Args:
+        index: HID devices from index_hid_devices_by_vid_pid; enumerated here when omitted
+    """
     matching_devices = []
+    # hid.enumerate() reports VID/PID as integers; parse ours once instead of formatting every device's
+    hid_vid_i = int(hid_vid, 16)
+    hid_pid_i = int(hid_pid, 16)
+    device_vid_hid = hid_vid.lower()
+    device_pid_hid = hid_pid.lower()
+    if index is None:
+        index = index_hid_devices_by_vid_pid()
+    
+    # Extract USB port info from HID path
+    # HID path format is usually like: /dev/hidraw1 or 1-5.1:1.4
+    # We need to match the USB port part (like 1-5.1) to our target port chain
+    
+    # Extract port part from target_port_chain (e.g., "usb1-1-5.1" -> "1-5.1")
+    target_port_part = target_port_chain.split('-', 1)[-1] if '-' in target_port_chain else target_port_chain
+    # Port chains are ASCII, so the test can run on the raw path bytes without decoding them
+    target_port_bytes = target_port_part.encode('utf-8')
     
-    # Get all HID devices with matching VID/PID
-    for hid_device in hid.enumerate():
-        device_vid_hid = f"{hid_device['vendor_id']:04x}"
-        device_pid_hid = f"{hid_device['product_id']:04x}"
+    # HID devices with matching VID/PID
+    for hid_device in index.get(vid_pid_key(hid_vid_i, hid_pid_i), ()):
+        path_bytes = hid_device['path']
         
-        if device_vid_hid.lower() == hid_vid.lower() and device_pid_hid.lower() == hid_pid.lower():
-            hid_path = hid_device['path'].decode('utf-8', errors='ignore')
-            
-            # Extract USB port info from HID path
-            # HID path format is usually like: /dev/hidraw1 or 1-5.1:1.4
-            # We need to match the USB port part (like 1-5.1) to our target port chain
-            
-            # Extract port part from target_port_chain (e.g., "usb1-1-5.1" -> "1-5.1")
-            target_port_part = target_port_chain.split('-', 1)[-1] if '-' in target_port_chain else target_port_chain
-            
-            # Check if the HID path contains the target port part
-            if target_port_part in hid_path:
-                matching_devices.append({
-                    "path": hid_device['path'],
-                    "vendor_id": device_vid_hid,
-                    "product_id": device_pid_hid,
-                    "manufacturer_string": hid_device.get('manufacturer_string', ''),
-                    "product_string": hid_device.get('product_string', ''),
-                    "serial_number": hid_device.get('serial_number', ''),
-                    "interface_number": hid_device.get('interface_number', -1),
-                    "port_chain": target_port_chain
-                })
+        # Check if the HID path contains the target port part
+        if target_port_bytes in path_bytes:
+            matching_devices.append({
+                "path": path_bytes,
+                "vendor_id": device_vid_hid,
+                "product_id": device_pid_hid,
+                "manufacturer_string": hid_device.get('manufacturer_string', ''),
+                "product_string": hid_device.get('product_string', ''),
+                "serial_number": hid_device.get('serial_number', ''),
+                "interface_number": hid_device.get('interface_number', -1),
+                "port_chain": target_port_chain
+            })
     
     return matching_devices
 
-def find_video_devices_by_port_chain(target_port_chain: str) -> List[Dict]:
-    """Find video devices associated with a specific port chain"""
-    context = pyudev.Context()
-    matching_devices = []
+def find_video_devices_by_port_chain(target_port_chain: str,
+                                     index: Optional[Dict[str, List[str]]] = None) -> List[Dict]:
+    """
+    Find video devices associated with a specific port chain
     
-    # Look for video devices and try to match them to the port chain
-    for device in context.list_devices(subsystem='video4linux'):
-        # Traverse up the device tree to find the USB parent
-        current = device
-        while current.parent:
-            if current.parent.subsystem == 'usb' and current.parent.get('DEVTYPE') == 'usb_device':
-                usb_device = current.parent
-                devpath = usb_device.get('DEVPATH', '')
-                port_chain = build_linux_port_chain(devpath)
-                
-                if port_chain == target_port_chain:
-                    device_node = device.device_node
-                    if device_node:
-                        matching_devices.append({
-                            "device": device_node,
-                            "name": f"Video Device {device_node}",
-                            "info": f"USB Video device on port {port_chain}",
-                            "port_chain": port_chain
-                        })
-                break
-            current = current.parent
+    Args:
+        index: video4linux nodes by port chain from index_nodes_by_port_chain; built here when omitted
+    """
+    if index is None:
+        index = index_nodes_by_port_chain(get_udev_context(), 'video4linux')
     
-    return matching_devices
+    return [{
+        "device": device_node,
+        "name": f"Video Device {device_node}",
+        "info": f"USB Video device on port {target_port_chain}",
+        "port_chain": target_port_chain
+    } for device_node in index.get(target_port_chain, ())]
 
-def find_audio_devices_by_port_chain(target_port_chain: str) -> List[Dict]:
-    """Find audio devices associated with a specific port chain"""
-    context = pyudev.Context()
-    matching_devices = []
+def read_alsa_playback_devices() -> List[Dict]:
+    """
+    List ALSA playback devices from /proc/asound, as `aplay -l` would, without running it
     
-    # Look for sound devices and try to match them to the port chain
-    for device in context.list_devices(subsystem='sound'):
-        # Traverse up the device tree to find the USB parent
-        current = device
-        while current.parent:
-            if current.parent.subsystem == 'usb' and current.parent.get('DEVTYPE') == 'usb_device':
-                usb_device = current.parent
-                devpath = usb_device.get('DEVPATH', '')
-                port_chain = build_linux_port_chain(devpath)
-                
-                if port_chain == target_port_chain:
-                    device_node = device.device_node
-                    if device_node:
-                        matching_devices.append({
-                            "device": device_node,
-                            "name": f"Audio Device on port {port_chain}",
-                            "info": f"USB Audio device",
-                            "port_chain": port_chain
-                        })
-                break
-            current = current.parent
+    Returns:
+        One dict per playback PCM with the `aplay -l` style "line" and the card's "driver"
+    """
+    try:
+        with open('/proc/asound/cards') as f:
+            cards_text = f.read()
+        with open('/proc/asound/pcm') as f:
+            pcm_text = f.read()
+    except OSError:
+        # No ALSA (or no sound cards at all)
+        return []
+    
+    cards = {int(match.group(1)): match.group(2, 3, 4) for match in ALSA_CARD_RE.finditer(cards_text)}
+    devices = []
+    for match in ALSA_PCM_RE.finditer(pcm_text):
+        card_number, device_number, pcm_id, pcm_name, streams = match.groups()
+        card = cards.get(int(card_number))
+        if card is None or 'playback' not in streams:
+            continue
+        card_id, driver, card_name = card
+        devices.append({
+            "line": f"card {int(card_number)}: {card_id} [{card_name}], device {int(device_number)}: {pcm_id} [{pcm_name}]",
+            "driver": driver
+        })
+    return devices
+
+def find_audio_devices_by_port_chain(target_port_chain: str,
+                                     index: Optional[Dict[str, List[str]]] = None,
+                                     alsa_devices: Optional[List[Dict]] = None) -> List[Dict]:
+    """
+    Find audio devices associated with a specific port chain
+    
+    Args:
+        index: sound nodes by port chain from index_nodes_by_port_chain; built here when omitted
+        alsa_devices: result of read_alsa_playback_devices; read here when omitted
+    """
+    if index is None:
+        index = index_nodes_by_port_chain(get_udev_context(), 'sound')
+    
+    matching_devices = [{
+        "device": device_node,
+        "name": f"Audio Device on port {target_port_chain}",
+        "info": f"USB Audio device",
+        "port_chain": target_port_chain
+    } for device_node in index.get(target_port_chain, ())]
     
     # Also check ALSA cards for USB audio
-    try:
-        result = subprocess.run(['aplay', '-l'], capture_output=True, text=True, timeout=5)
-        if result.returncode == 0:
-            lines = result.stdout.split('\n')
-            for line in lines:
-                if 'USB' in line and 'card' in line.lower():
-                    # This is a rough match - could be improved with more detailed parsing
-                    matching_devices.append({
-                        "device": line.strip(),
-                        "name": f"USB Audio Device",
-                        "info": line.strip(),
-                        "port_chain": target_port_chain  # Associate with target port chain
-                    })
-    except (subprocess.TimeoutExpired, FileNotFoundError):
-        pass
+    if alsa_devices is None:
+        alsa_devices = read_alsa_playback_devices()
+    for alsa_device in alsa_devices:
+        if alsa_device["driver"] == 'USB-Audio':
+            # This is a rough match - could be improved with more detailed parsing
+            matching_devices.append({
+                "device": alsa_device["line"],
+                "name": f"USB Audio Device",
+                "info": alsa_device["line"],
+                "port_chain": target_port_chain  # Associate with target port chain
+            })
     
     return matching_devices
 
+def list_dir_entries(path: str) -> List[os.DirEntry]:
+    """Non-hidden entries of a directory sorted by name, or [] if it does not exist"""
+    try:
+        with os.scandir(path) as it:
+            return sorted((entry for entry in it if not entry.name.startswith('.')), key=lambda entry: entry.name)
+    except OSError:
+        return []
+
+def read_sysfs_attribute(path: str) -> Optional[str]:
+    """Read a sysfs attribute file, or None if it cannot be read"""
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+def read_tty_devpath(tty_name: str) -> str:
+    """DEVPATH of a tty from its /sys/class/tty link; raises OSError if it has none"""
+    link = os.readlink(os.path.join('/sys/class/tty', tty_name))
+    return os.path.normpath(os.path.join('/sys/class/tty', link))[len('/sys'):]
+
+def usb_devpath_of(devpath: str) -> Optional[str]:
+    """DEVPATH of the USB device devpath belongs to, or None if it is not on USB"""
+    match = _USB_DEVPATH_RE.match(devpath)
+    return match.group(0) if match else None
+
 def find_video_devices() -> List[Dict]:
     """Find video devices (cameras)"""
     devices = []
     
-    # Look for video devices in /dev/video*
-    video_devices = glob.glob('/dev/video*')
-    
-    for video_dev in video_devices:
+    # Card name and driver come straight from sysfs, the same data v4l2-ctl --info reports
+    for entry in list_dir_entries('/sys/class/video4linux'):
+        if not entry.name.startswith('video'):
+            continue
+        sysdir = entry.path
+        video_dev = '/dev/' + entry.name
+        info = []
         try:
-            # Get device info using v4l2-ctl if available
-            result = subprocess.run(['v4l2-ctl', '--device', video_dev, '--info'], 
-                                  capture_output=True, text=True, timeout=5)
-            if result.returncode == 0:
-                devices.append({
-                    "device": video_dev,
-                    "name": f"Video Device {video_dev}",
-                    "info": result.stdout.strip()
-                })
-            else:
-                # Fallback: just add the device path
-                devices.append({
-                    "device": video_dev,
-                    "name": f"Video Device {video_dev}",
-                    "info": "No detailed info available"
-                })
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            # v4l2-ctl not available or timeout
-            devices.append({
-                "device": video_dev,
-                "name": f"Video Device {video_dev}",
-                "info": "v4l2-ctl not available"
-            })
+            info.append(f"Driver name: {os.path.basename(os.readlink(os.path.join(sysdir, 'device', 'driver')))}")
+        except OSError:
+            pass
+        name = read_sysfs_attribute(os.path.join(sysdir, 'name'))
+        if name:
+            info.append(f"Card type: {name}")
+        devices.append({
+            "device": video_dev,
+            "name": f"Video Device {video_dev}",
+            "info": "\n".join(info) if info else "No detailed info available"
+        })
     
     return devices
 
@@ -367,30 +591,21 @@ def find_audio_devices() -> List[Dict]:
     devices = []
     
     # Look for audio devices using ALSA
-    try:
-        # List audio cards
-        result = subprocess.run(['aplay', '-l'], capture_output=True, text=True, timeout=5)
-        if result.returncode == 0:
-            lines = result.stdout.split('\n')
-            for line in lines:
-                if 'card' in line.lower():
-                    devices.append({
-                        "device": line.strip(),
-                        "name": f"Audio Device",
-                        "info": line.strip()
-                    })
-    except (subprocess.TimeoutExpired, FileNotFoundError):
-        pass
+    for alsa_device in read_alsa_playback_devices():
+        devices.append({
+            "device": alsa_device["line"],
+            "name": f"Audio Device",
+            "info": alsa_device["line"]
+        })
     
     # Also check /dev/snd/
-    snd_devices = glob.glob('/dev/snd/*')
-    for snd_dev in snd_devices:
-        if os.path.exists(snd_dev):
-            devices.append({
-                "device": snd_dev,
-                "name": f"Sound Device {snd_dev}",
-                "info": "ALSA sound device"
-            })
+    for entry in list_dir_entries('/dev/snd'):
+        snd_dev = entry.path
+        devices.append({
+            "device": snd_dev,
+            "name": f"Sound Device {snd_dev}",
+            "info": "ALSA sound device"
+        })
     
     return devices
 
@@ -399,13 +614,18 @@ def collect_device_ids(serial_vid: str, serial_pid: str, hid_vid: str, hid_pid:
     According VID/PID find physical device, collect serial_port、HID、camera、audio device id
     return device_hardware_id_list grouped by port chain.
     """
-    devices = find_usb_devices_with_vid_pid(hid_vid, hid_pid)
+    devices = find_usb_devices_with_vid_pid(hid_vid, hid_pid, with_relations=False)
     device_info_list = []
     
     if devices:
+        # One udev pass per subsystem serves every matched device
+        udev_index = build_udev_index()
+        alsa_devices = read_alsa_playback_devices()
+        hid_index = index_hid_devices_by_vid_pid(cached_hid_enumerate())
+        serial_index = index_serial_ports_by_vid_pid(cached_comports())
         for i, device in enumerate(devices, 1):
             port_chain = device["port_chain"][0] if device["port_chain"] else ""
-            CoreLogger.info(f"Device {i} Port Chain: {port_chain}")
+            CoreLogger.info("Device %s Port Chain: %s", i, port_chain)
             
             device_hardware_info = {
                 "serial_port": "",
@@ -420,32 +640,32 @@ def collect_device_ids(serial_vid: str, serial_pid: str, hid_vid: str, hid_pid:
             }
             
             # Find serial ports specifically for this port chain
-            serial_ports = find_serial_ports_by_port_chain(serial_vid, serial_pid, port_chain)
+            serial_ports = find_serial_ports_by_port_chain(serial_vid, serial_pid, port_chain, udev_index['tty'], serial_index)
             if serial_ports:
                 device_hardware_info["serial_port"] = serial_ports[0]["device"]
                 device_hardware_info["serial_port_path"] = serial_ports[0]["device"]
-                CoreLogger.info(f"Found serial port: {serial_ports[0]['device']} on port chain: {port_chain}")
+                CoreLogger.info("Found serial port: %s on port chain: %s", serial_ports[0]['device'], port_chain)
             
             # Find HID devices specifically for this port chain
-            hid_devices = find_hid_devices_by_port_chain(hid_vid, hid_pid, port_chain)
+            hid_devices = find_hid_devices_by_port_chain(hid_vid, hid_pid, port_chain, hid_index)
             if hid_devices:
                 device_hardware_info["HID"] = hid_devices[0]["product_string"]
                 device_hardware_info["HID_path"] = hid_devices[0]["path"]
-                CoreLogger.info(f"Found HID device: {hid_devices[0]['product_string']} on port chain: {port_chain}")
+                CoreLogger.info("Found HID device: %s on port chain: %s", hid_devices[0]['product_string'], port_chain)
             
             # Find video devices specifically for this port chain
-            video_devices = find_video_devices_by_port_chain(port_chain)
+            video_devices = find_video_devices_by_port_chain(port_chain, udev_index['video4linux'])
             if video_devices:
                 device_hardware_info["camera"] = video_devices[0]["name"]
                 device_hardware_info["camera_path"] = video_devices[0]["device"]
-                CoreLogger.info(f"Found video device: {video_devices[0]['device']} on port chain: {port_chain}")
+                CoreLogger.info("Found video device: %s on port chain: %s", video_devices[0]['device'], port_chain)
             
             # Find audio devices specifically for this port chain
-            audio_devices = find_audio_devices_by_port_chain(port_chain)
+            audio_devices = find_audio_devices_by_port_chain(port_chain, udev_index['sound'], alsa_devices)
             if audio_devices:
                 device_hardware_info["audio"] = audio_devices[0]["name"]
                 device_hardware_info["audio_path"] = audio_devices[0]["device"]
-                CoreLogger.info(f"Found audio device: {audio_devices[0]['device']} on port chain: {port_chain}")
+                CoreLogger.info("Found audio device: %s on port chain: %s", audio_devices[0]['device'], port_chain)
             
             device_info_list.append(device_hardware_info)
     else:
@@ -455,49 +675,124 @@ def collect_device_ids(serial_vid: str, serial_pid: str, hid_vid: str, hid_pid:
 
 def search_physical_device(serial_vid: str, serial_pid: str, hid_vid: str, hid_pid: str) -> List[Dict]:
     """Search for physical devices and return their information"""
-    return collect_device_ids(serial_vid, serial_pid, hid_vid, hid_pid)
+    start_enumeration_pass()
+    try:
+        return collect_device_ids(serial_vid, serial_pid, hid_vid, hid_pid)
+    finally:
+        end_enumeration_pass()
 
 class LinuxDeviceManager(AbstractDeviceManager):
     """Linux implementation of the abstract device manager"""
     
-    def __init__(self, serial_vid: str, serial_pid: str, hid_vid: str, hid_pid: str):
-        super().__init__(serial_vid, serial_pid, hid_vid, hid_pid)
+    def __init__(self, serial_vid: str, serial_pid: str, hid_vid: str, hid_pid: str,
+                 cache_ttl: float = 0.5):
+        super().__init__(serial_vid, serial_pid, hid_vid, hid_pid, cache_ttl)
+        import pyudev
         self.context = pyudev.Context()
+        # Enumeration indexes shared by all matched devices, each stored as (hotplug token, index).
+        # They are reused only while a uevent monitor bumps _hotplug_token; without one (None)
+        # every discovery rebuilds them
+        self._hotplug_token = None
+        # The index builders run on the enumeration pool; one lock per index makes
+        # overlapping discoveries share a build instead of racing to store their own
+        self._index_locks = {attr: threading.Lock()
+                             for attr in ('_udev_index', '_alsa_devices', '_hid_index', '_serial_index')}
+        self._drop_indexes()
+
+    def _drop_indexes(self):
+        self._udev_index = None
+        self._alsa_devices = None
+        self._hid_index = None
+        self._serial_index = None
+
+    def invalidate_cache(self):
+        """Drop the cached discovery result and enumeration indexes, e.g. after a hotplug event"""
+        super().invalidate_cache()
+        self._drop_indexes()
+
+    def track_hotplug_events(self, enabled: bool):
+        """Called by a uevent monitor: while enabled, indexes last until note_hotplug_event()"""
+        self._hotplug_token = 0 if enabled else None
+        self._drop_indexes()
+
+    def note_hotplug_event(self):
+        """Record a relevant uevent so the next discovery rebuilds the enumeration indexes"""
+        if self._hotplug_token is not None:
+            self._hotplug_token += 1
+
+    def _cached_until_hotplug(self, attr: str, build: Callable[[], Any]) -> Any:
+        """Return the (token, value) pair stored in attr if still current, else rebuild it"""
+        with self._index_locks[attr]:
+            token = self._hotplug_token
+            cached = getattr(self, attr)
+            if token is not None and cached is not None and cached[0] == token:
+                return cached[1]
+            value = build()
+            # Tagged with the token read before the build, so an event during it forces a rebuild
+            setattr(self, attr, (token, value))
+            return value
+
+    def _get_udev_index(self) -> Dict[str, Dict[str, List[str]]]:
+        """Port-chain indexes for this discovery, reused while no hotplug event has been seen"""
+        return self._cached_until_hotplug('_udev_index', build_udev_index)
 
-    def discover_devices(self) -> List[DeviceInfo]:
+    def _get_alsa_devices(self) -> List[Dict]:
+        """ALSA playback devices for this discovery, reused while no hotplug event has been seen"""
+        return self._cached_until_hotplug('_alsa_devices', read_alsa_playback_devices)
+
+    def _get_hid_index(self) -> Dict[int, List[Dict]]:
+        """HID devices by VID/PID for this discovery, reused while no hotplug event has been seen"""
+        return self._cached_until_hotplug('_hid_index', index_hid_devices_by_vid_pid)
+
+    def _get_serial_index(self) -> Dict[int, List[Any]]:
+        """Serial ports by VID/PID for this discovery, reused while no hotplug event has been seen"""
+        return self._cached_until_hotplug('_serial_index', index_serial_ports_by_vid_pid)
+
+    def _discover_devices_impl(self) -> List[DeviceInfo]:
         """Discover all devices matching the specified VID/PID on Linux"""
         device_info_list = []
-        devices = find_usb_devices_with_vid_pid(self.hid_vid, self.hid_pid)
+        devices = find_usb_devices_with_vid_pid(self.hid_vid, self.hid_pid, with_relations=False)
         
         if devices:
-            for i, device in enumerate(devices, 1):
-                port_chain = device["port_chain"][0] if device["port_chain"] else ""
+            port_chains = [device["port_chain"][0] if device["port_chain"] else "" for device in devices]
+            # Building the indexes is what blocks, each on a separate subsystem (udev, ALSA,
+            # hidraw, serial), so build them all at once; the per-device lookups below only
+            # probe the resulting dicts
+            udev_index, alsa_devices, hid_index, serial_index = self._enumerate_parallel([
+                self._get_udev_index,
+                self._get_alsa_devices,
+                self._get_hid_index,
+                self._get_serial_index,
+            ])
+            
+            for device, port_chain in zip(devices, port_chains):
+                serial_ports = find_serial_ports_by_port_chain(self.serial_vid, self.serial_pid, port_chain,
+                                                               udev_index['tty'], serial_index)
+                hid_devices = find_hid_devices_by_port_chain(self.hid_vid, self.hid_pid, port_chain, hid_index)
+                video_devices = find_video_devices_by_port_chain(port_chain, udev_index['video4linux'])
+                audio_devices = find_audio_devices_by_port_chain(port_chain, udev_index['sound'], alsa_devices)
                 
                 device_info = DeviceInfo(
                     port_chain=port_chain,
                     platform_specific={'device_info': device.get('device_info', {})}
                 )
                 
-                # Find serial ports specifically for this port chain
-                serial_ports = find_serial_ports_by_port_chain(self.serial_vid, self.serial_pid, port_chain)
+                # Serial ports specifically for this port chain
                 if serial_ports:
                     device_info.serial_port = serial_ports[0]["device"]
                     device_info.serial_port_path = serial_ports[0]["device"]
                 
-                # Find HID devices specifically for this port chain
-                hid_devices = find_hid_devices_by_port_chain(self.hid_vid, self.hid_pid, port_chain)
+                # HID devices specifically for this port chain
                 if hid_devices:
                     device_info.hid_device = hid_devices[0]["product_string"]
                     device_info.hid_path = hid_devices[0]["path"]
                 
-                # Find video devices specifically for this port chain
-                video_devices = find_video_devices_by_port_chain(port_chain)
+                # Video devices specifically for this port chain
                 if video_devices:
                     device_info.camera_device = video_devices[0]["name"]
                     device_info.camera_path = video_devices[0]["device"]
                 
-                # Find audio devices specifically for this port chain
-                audio_devices = find_audio_devices_by_port_chain(port_chain)
+                # Audio devices specifically for this port chain
                 if audio_devices:
                     device_info.audio_device = audio_devices[0]["name"]
                     device_info.audio_path = audio_devices[0]["device"]
@@ -514,8 +809,79 @@ class LinuxDeviceManager(AbstractDeviceManager):
 
 class LinuxHotplugMonitor(AbstractHotplugMonitor):
     """Linux implementation of the abstract hotplug monitor"""
-    def __init__(self, device_manager: LinuxDeviceManager, poll_interval: float = 2.0):
-        super().__init__(device_manager, poll_interval)
+    def __init__(self, device_manager: LinuxDeviceManager, poll_interval: float = 2.0,
+                 warm_start: bool = False):
+        super().__init__(device_manager, poll_interval, warm_start)
+        self._udev_monitor = None
+        self._vendor_ids = {device_manager.serial_vid.lower(), device_manager.hid_vid.lower()}
+
+    def start_monitoring(self, wait: bool = True):
+        """Start monitoring for device changes"""
+        if not self.running:
+            # Subscribe before the initial snapshot so no change falls between the two
+            self._start_udev_monitor()
+        super().start_monitoring(wait)
+
+    def stop_monitoring(self):
+        """Stop monitoring for device changes"""
+        super().stop_monitoring()
+        self._udev_monitor = None
+        self.device_manager.track_hotplug_events(False)
+
+    def _start_udev_monitor(self):
+        """Subscribe to udev netlink uevents; on failure the monitor keeps polling"""
+        if self._udev_monitor is not None:
+            return
+        try:
+            import pyudev
+            monitor = pyudev.Monitor.from_netlink(self.device_manager.context)
+            for subsystem in HOTPLUG_SUBSYSTEMS:
+                monitor.filter_by(subsystem)
+            monitor.start()
+        except Exception as e:
+            CoreLogger.warning(f"udev monitor unavailable, falling back to polling: {e}")
+            return
+        self._udev_monitor = monitor
+        self.device_manager.track_hotplug_events(True)
+
+    def _is_relevant_event(self, device) -> bool:
+        """Whether a uevent may concern one of our devices; events without a vendor ID are kept"""
+        if device.action not in HOTPLUG_ACTIONS:
+            return False
+        vendor_id = device.get('ID_VENDOR_ID')
+        return vendor_id is None or vendor_id.lower() in self._vendor_ids
+
+    @property
+    def uses_device_events(self) -> bool:
+        return self._udev_monitor is not None
+
+    def _wait_for_device_event(self, timeout: float) -> bool:
+        """Wait for a uevent concerning one of our devices"""
+        monitor = self._udev_monitor
+        if monitor is None:
+            return super()._wait_for_device_event(timeout)
+        try:
+            device = monitor.poll(timeout=timeout)
+            if device is None:
+                return False
+            # Plugging in a device raises uevents for each of its interfaces; handle the burst as one change
+            deadline = time.monotonic() + self._debounce_max
+            relevant = self._is_relevant_event(device)
+            while True:
+                wait_time = self._debounce_wait_time(deadline)
+                if wait_time <= 0:
+                    break
+                device = monitor.poll(timeout=wait_time)
+                if device is None:
+                    break
+                relevant = relevant or self._is_relevant_event(device)
+        except OSError as e:
+            # Typically ENOBUFS: the netlink buffer overflowed and uevents were lost, so rescan
+            CoreLogger.debug("udev monitor read failed, rescanning: %s", e)
+            relevant = True
+        if relevant:
+            self.device_manager.note_hotplug_event()
+        return relevant
 
     def _create_monitor_thread(self):
         return threading.Thread(target=self._monitor_loop, daemon=True)
@@ -523,9 +889,10 @@ class LinuxHotplugMonitor(AbstractHotplugMonitor):
     def _monitor_loop(self):
         while self.running:
             try:
+                if not self._wait_for_rescan():
+                    continue
                 current_snapshot = self.device_manager.create_snapshot()
                 self._handle_device_changes(current_snapshot)
-                time.sleep(self.poll_interval)
             except Exception as e:
                 CoreLogger.error(f"Error in Linux hotplug monitoring loop: {e}")
                 time.sleep(self.poll_interval)
@@ -539,6 +906,11 @@ class HotplugMonitor(LinuxHotplugMonitor):
         super().__init__(device_manager, poll_interval)
 
 
+# Fields the legacy DeviceSnapshot compares; every DeviceInfo.to_dict() result has them
+LEGACY_IMPORTANT_FIELDS = ('serial_port', 'serial_port_path', 'HID', 'HID_path',
+                           'camera', 'camera_path', 'audio', 'audio_path', 'port_chain')
+_important_fields_of = itemgetter(*LEGACY_IMPORTANT_FIELDS)
+
 class DeviceSnapshot:
     """Legacy compatibility class for Linux"""
     
@@ -566,6 +938,8 @@ class DeviceSnapshot:
                     if isinstance(v, (str, int, float, bool, list, dict, type(None)))
                 }
             self.devices.append(device_dict)
+        # Index the devices by key once; compare_with then only does lookups
+        self._by_key = {self._device_key(dev): dev for dev in self.devices}
         
     def compare_with(self, other_snapshot):
         """Compare this snapshot with another snapshot"""
@@ -575,76 +949,81 @@ class DeviceSnapshot:
             'modified_devices': []
         }
         
-        # Convert device lists to dictionaries for easier comparison
-        current_devices = {self._device_key(dev): dev for dev in self.devices}
-        other_devices = {self._device_key(dev): dev for dev in other_snapshot.devices}
+        # Both snapshots were indexed by device key when they were taken
+        current_devices = self._by_key
+        other_devices = other_snapshot._by_key
         
         # Find added devices
-        for key, device in current_devices.items():
-            if key not in other_devices:
-                changes['added_devices'].append(device)
+        changes['added_devices'] = [device for key, device in current_devices.items()
+                                    if key not in other_devices]
         
         # Find removed devices
-        for key, device in other_devices.items():
-            if key not in current_devices:
-                changes['removed_devices'].append(device)
+        changes['removed_devices'] = [device for key, device in other_devices.items()
+                                      if key not in current_devices]
         
-        # Find modified devices
+        # Find modified devices; 'old' and 'new' are the snapshots' own dicts, not copies,
+        # and 'diff' lists just the (field, old, new) values that changed
         for key, device in current_devices.items():
-            if key in other_devices:
-                if not self._devices_equal(device, other_devices[key]):
-                    changes['modified_devices'].append({
-                        'old': other_devices[key],
-                        'new': device
-                    })
+            old_device = other_devices.get(key)
+            if old_device is None:
+                continue
+            old_values = _important_fields_of(old_device)
+            new_values = _important_fields_of(device)
+            if old_values != new_values:
+                changes['modified_devices'].append({
+                    'old': old_device,
+                    'new': device,
+                    'key': key,
+                    'diff': [(field, old_value, new_value)
+                             for field, old_value, new_value in zip(LEGACY_IMPORTANT_FIELDS, old_values, new_values)
+                             if old_value != new_value]
+                })
         
         return changes
     
-    def _device_key(self, device):
-        """Generate a unique key for a device"""
-        return f"{device.get('serial_port', '')}-{device.get('HID', '')}-{device.get('camera', '')}"
+    # Devices come from DeviceInfo.to_dict(), so the key fields are always present
+    _device_key = staticmethod(itemgetter('serial_port', 'HID', 'camera'))
     
     def _devices_equal(self, dev1, dev2):
         """Check if two devices are equal"""
         # Compare only the important fields, not platform_specific
-        important_fields = ['serial_port', 'serial_port_path', 'HID', 'HID_path', 
-                          'camera', 'camera_path', 'audio', 'audio_path', 'port_chain']
-        
-        for field in important_fields:
-            if dev1.get(field) != dev2.get(field):
-                return False
-        return True
+        return _important_fields_of(dev1) == _important_fields_of(dev2)
 
 # Backward compatibility functions (without port chain filtering)
 def find_serial_ports_by_vid_pid(vid: str, pid: str) -> List[Dict]:
     """Find serial ports by VID/PID (all instances)"""
     ports = []
-    for port in serial.tools.list_ports.comports():
-        if port.vid and port.pid:
-            port_vid = f"{port.vid:04x}"
-            port_pid = f"{port.pid:04x}"
-            if port_vid.lower() == vid.lower() and port_pid.lower() == pid.lower():
-                ports.append({
-                    "device": port.device,
-                    "name": port.name,
-                    "description": port.description,
-                    "hwid": port.hwid,
-                    "vid": port_vid,
-                    "pid": port_pid,
-                    "serial_number": port.serial_number,
-                    "location": port.location,
-                    "manufacturer": port.manufacturer,
-                    "product": port.product
-                })
+    # Compare as integers; every match shares the target's VID/PID, so format it once
+    vid_i = int(vid, 16)
+    pid_i = int(pid, 16)
+    port_vid = format(vid_i, '04x')
+    port_pid = format(pid_i, '04x')
+    for port in cached_comports():
+        if port.vid == vid_i and port.pid == pid_i:
+            ports.append({
+                "device": port.device,
+                "name": port.name,
+                "description": port.description,
+                "hwid": port.hwid,
+                "vid": port_vid,
+                "pid": port_pid,
+                "serial_number": port.serial_number,
+                "location": port.location,
+                "manufacturer": port.manufacturer,
+                "product": port.product
+            })
     return ports
 
 def find_hid_devices_by_vid_pid(vid: str, pid: str) -> List[Dict]:
     """Find HID devices by VID/PID (all instances)"""
     devices = []
-    for device in hid.enumerate():
-        device_vid = f"{device['vendor_id']:04x}"
-        device_pid = f"{device['product_id']:04x}"
-        if device_vid.lower() == vid.lower() and device_pid.lower() == pid.lower():
+    # Compare as integers; every match shares the target's VID/PID, so format it once
+    vid_i = int(vid, 16)
+    pid_i = int(pid, 16)
+    device_vid = format(vid_i, '04x')
+    device_pid = format(pid_i, '04x')
+    for device in cached_hid_enumerate():
+        if device['vendor_id'] == vid_i and device['product_id'] == pid_i:
             devices.append({
                 "path": device['path'],
                 "vendor_id": device_vid,
@@ -660,7 +1039,7 @@ def find_hid_devices_by_vid_pid(vid: str, pid: str) -> List[Dict]:
 def list_all_serial_ports() -> List[Dict]:
     """List all available serial ports"""
     ports = []
-    for port in serial.tools.list_ports.comports():
+    for port in cached_comports():
         port_info = {
             "device": port.device,
             "name": port.name,
@@ -674,108 +1053,133 @@ def list_all_serial_ports() -> List[Dict]:
             "product": port.product
         }
         ports.append(port_info)
-        CoreLogger.info(f"Serial Port: {port.device} - {port.description}")
+        CoreLogger.info("Serial Port: %s - %s", port.device, port.description)
     return ports
 
-def list_all_hid_devices() -> List[Dict]:
+# One list_all_hid_devices() entry; _asdict() gives the keyed form the other HID helpers return
+HidRec = namedtuple('HidRec', 'path vendor_id product_id manufacturer_string product_string '
+                              'serial_number interface_number')
+
+def list_all_hid_devices() -> List[HidRec]:
     """List all available HID devices"""
-    devices = []
-    for device in hid.enumerate():
-        device_info = {
-            "path": device['path'],
-            "vendor_id": f"{device['vendor_id']:04x}",
-            "product_id": f"{device['product_id']:04x}",
-            "manufacturer_string": device.get('manufacturer_string', ''),
-            "product_string": device.get('product_string', ''),
-            "serial_number": device.get('serial_number', ''),
-            "interface_number": device.get('interface_number', -1)
-        }
-        devices.append(device_info)
-        CoreLogger.info(f"HID Device: {device['product_string']} - VID:{device_info['vendor_id']} PID:{device_info['product_id']}")
+    devices = [HidRec(device['path'],
+                      f"{device['vendor_id']:04x}",
+                      f"{device['product_id']:04x}",
+                      device.get('manufacturer_string', ''),
+                      device.get('product_string', ''),
+                      device.get('serial_number', ''),
+                      device.get('interface_number', -1))
+               for device in cached_hid_enumerate()]
+    for device in devices:
+        CoreLogger.info("HID Device: %s - VID:%s PID:%s", device.product_string, device.vendor_id, device.product_id)
     return devices
 
 def list_all_video_devices() -> List[Dict]:
     """List all available video devices"""
     devices = find_video_devices()
     for device in devices:
-        CoreLogger.info(f"Video Device: {device['device']} - {device['name']}")
+        CoreLogger.info("Video Device: %s - %s", device['device'], device['name'])
     return devices
 
 def list_all_audio_devices() -> List[Dict]:
     """List all available audio devices"""
     devices = find_audio_devices()
     for device in devices:
-        CoreLogger.info(f"Audio Device: {device['device']} - {device['name']}")
+        CoreLogger.info("Audio Device: %s - %s", device['device'], device['name'])
     return devices
 
 def debug_serial_port_info(serial_vid: str, serial_pid: str) -> None:
     """Debug function to show detailed serial port information"""
-    CoreLogger.info(f"=== DEBUG: Serial Port Analysis for VID:{serial_vid.upper()} PID:{serial_pid.upper()} ===")
+    # Everything below only feeds DEBUG records, so skip the enumeration when they are dropped
+    if not CoreLogger.isEnabledFor(logging.DEBUG):
+        return
+    
+    CoreLogger.debug("=== DEBUG: Serial Port Analysis for VID:%s PID:%s ===", serial_vid.upper(), serial_pid.upper())
+    # comports() reports VID/PID as integers
+    target_vid = int(serial_vid, 16)
+    target_pid = int(serial_pid, 16)
     
     # Show all serial ports with their details
-    serial_ports = list(serial.tools.list_ports.comports())
-    CoreLogger.info(f"Found {len(serial_ports)} total serial ports:")
+    serial_ports = cached_comports()
+    CoreLogger.debug("Found %s total serial ports:", len(serial_ports))
+    
+    # tty devices by node and USB devices by sys_path, listed only if a tty has no sysfs link
+    tty_devices = usb_devices = None
     
     for i, port in enumerate(serial_ports, 1):
-        CoreLogger.info(f"\nSerial Port {i}:")
-        CoreLogger.info(f"  Device: {port.device}")
-        CoreLogger.info(f"  Name: {port.name}")
-        CoreLogger.info(f"  Description: {port.description}")
-        CoreLogger.info(f"  VID: {f'{port.vid:04x}' if port.vid else 'None'}")
-        CoreLogger.info(f"  PID: {f'{port.pid:04x}' if port.pid else 'None'}")
-        CoreLogger.info(f"  Serial Number: {port.serial_number}")
-        CoreLogger.info(f"  Location: {port.location}")
-        CoreLogger.info(f"  Manufacturer: {port.manufacturer}")
-        CoreLogger.info(f"  Product: {port.product}")
-        CoreLogger.info(f"  HWID: {port.hwid}")
+        # One record per port rather than one per line
+        parts = [
+            f"\nSerial Port {i}:",
+            f"  Device: {port.device}",
+            f"  Name: {port.name}",
+            f"  Description: {port.description}",
+            f"  VID: {f'{port.vid:04x}' if port.vid else 'None'}",
+            f"  PID: {f'{port.pid:04x}' if port.pid else 'None'}",
+            f"  Serial Number: {port.serial_number}",
+            f"  Location: {port.location}",
+            f"  Manufacturer: {port.manufacturer}",
+            f"  Product: {port.product}",
+            f"  HWID: {port.hwid}",
+        ]
         
         # Check if this matches our target VID/PID
-        if port.vid and port.pid:
-            port_vid = f"{port.vid:04x}"
-            port_pid = f"{port.pid:04x}"
-            if port_vid.lower() == serial_vid.lower() and port_pid.lower() == serial_pid.lower():
-                CoreLogger.info(f"  *** MATCHES TARGET VID/PID ***")
+        if port.vid == target_vid and port.pid == target_pid:
+            parts.append("  *** MATCHES TARGET VID/PID ***")
         
-        # Try to find the USB parent device
+        # The tty's sysfs link spells out its whole device path, USB parent included
         try:
-            import pyudev
-            context = pyudev.Context()
-            for device in context.list_devices(subsystem='tty'):
-                if device.device_node == port.device:
-                    CoreLogger.info(f"  TTY Device Path: {device.device_path}")
-                    
-                    # Traverse up to find USB parent
-                    current = device
-                    level = 0
-                    while current.parent and level < 5:  # Limit to 5 levels
-                        parent = current.parent
-                        CoreLogger.info(f"  Parent Level {level}: {parent.subsystem} - {parent.get('DEVTYPE', 'N/A')}")
-                        
-                        if parent.subsystem == 'usb' and parent.get('DEVTYPE') == 'usb_device':
-                            devpath = parent.get('DEVPATH', '')
-                            port_chain = build_linux_port_chain(devpath)
-                            CoreLogger.info(f"  USB Parent Port Chain: {port_chain}")
-                            CoreLogger.info(f"  USB Parent VID: {parent.get('ID_VENDOR_ID', 'N/A')}")
-                            CoreLogger.info(f"  USB Parent PID: {parent.get('ID_MODEL_ID', 'N/A')}")
-                            break
-                        
-                        current = parent
-                        level += 1
-                    break
-        except Exception as e:
-            CoreLogger.info(f"  Error getting USB parent: {e}")
+            tty_devpath = read_tty_devpath(os.path.basename(port.device))
+        except OSError:
+            tty_devpath = None
+        if tty_devpath is not None:
+            parts.append(f"  TTY Device Path: {tty_devpath}")
+            usb_devpath = usb_devpath_of(tty_devpath)
+            if usb_devpath is not None:
+                usb_sysdir = '/sys' + usb_devpath
+                parts.append(f"  USB Parent Device Path: {usb_devpath}")
+                parts.append(f"  USB Parent Port Chain: {build_linux_port_chain(usb_devpath)}")
+                parts.append(f"  USB Parent VID: {read_sysfs_attribute(usb_sysdir + '/idVendor') or 'N/A'}")
+                parts.append(f"  USB Parent PID: {read_sysfs_attribute(usb_sysdir + '/idProduct') or 'N/A'}")
+            else:
+                parts.append("  No USB parent device")
+        else:
+            # Otherwise ask udev for the USB parent device
+            if tty_devices is None:
+                try:
+                    context = get_udev_context()
+                    tty_devices = {device.device_node: device
+                                   for device in context.list_devices(subsystem='tty') if device.device_node}
+                    usb_devices = {device.sys_path: device
+                                   for device in context.list_devices(subsystem='usb', DEVTYPE='usb_device')}
+                except Exception as e:
+                    CoreLogger.debug("  Error listing udev devices: %s", e)
+                    tty_devices = usb_devices = {}
+            device = tty_devices.get(port.device)
+            if device is not None:
+                try:
+                    parts.append(f"  TTY Device Path: {device.device_path}")
+                
+                    # The USB parent is the closest USB device whose sys_path prefixes the tty's
+                    parent = nearest_ancestor(device.sys_path, usb_devices)
+                    if parent is not None:
+                        port_chain = build_linux_port_chain(parent.get('DEVPATH', ''))
+                        parts.append(f"  USB Parent Device Path: {parent.device_path}")
+                        parts.append(f"  USB Parent Port Chain: {port_chain}")
+                        # Read straight from sysfs rather than through the udev property database
+                        parts.append(f"  USB Parent VID: {read_sysfs_attribute(parent.sys_path + '/idVendor') or 'N/A'}")
+                        parts.append(f"  USB Parent PID: {read_sysfs_attribute(parent.sys_path + '/idProduct') or 'N/A'}")
+                    else:
+                        parts.append("  No USB parent device")
+                except Exception as e:
+                    parts.append(f"  Error getting USB parent: {e}")
+        
+        CoreLogger.debug("%s", "\n".join(parts))
     
-    CoreLogger.info(f"\n=== END DEBUG ===\n")
+    CoreLogger.debug("\n=== END DEBUG ===\n")
 
 def extract_main_port_from_chain(port_chain: str) -> str:
     """Extract the main port from a port chain (e.g., 'usb1-1-5.1' -> '1-5')"""
-    if '-' in port_chain:
-        parts = port_chain.split('-')
-        if len(parts) >= 3:  # usb1-1-5.1 -> ["usb1", "1", "5.1"]
-            # Get the main port part (1-5 from 1-5.1)
-            main_part = parts[2].split('.')[0]  # "5.1" -> "5"
-            return f"{parts[1]}-{main_part}"  # "1-5"
-    return port_chain
+    return get_main_port(port_chain) or port_chain
 
 if __name__ == "__main__":
     # Example usage
@@ -787,16 +1191,16 @@ if __name__ == "__main__":
     hid_vid = "534D"
     hid_pid = "2109"
     
-    CoreLogger.info(f"Searching for devices with Serial VID:{serial_vid} PID:{serial_pid}, HID VID:{hid_vid} PID:{hid_pid}")
+    CoreLogger.info("Searching for devices with Serial VID:%s PID:%s, HID VID:%s PID:%s", serial_vid, serial_pid, hid_vid, hid_pid)
     
     # Search for specific devices
     device_info_list = search_physical_device(serial_vid, serial_pid, hid_vid, hid_pid)
     
-    CoreLogger.info(f"\nFound {len(device_info_list)} matching device groups:")
+    CoreLogger.info("\nFound %s matching device groups:", len(device_info_list))
     for i, device_hardware_id in enumerate(device_info_list, 1):
-        CoreLogger.info(f"\n--- Device Group {i} ---")
+        CoreLogger.info("\n--- Device Group %s ---", i)
         for key, value in device_hardware_id.items():
-            CoreLogger.info(f"{key}: {value}")
+            CoreLogger.info("%s: %s", key, value)
     
     # List all devices for reference
     CoreLogger.info("\n=== All Available Devices ===")
@@ -813,5 +1217,5 @@ if __name__ == "__main__":
     CoreLogger.info("\n--- All Audio Devices ---")
     list_all_audio_devices()
 
-    # Debug serial port information
+    # Debug serial port information (logged at DEBUG, so only shown when the core logger allows it)
     debug_serial_port_info(serial_vid, serial_pid)
@@ -1,7 +1,7 @@
 import ctypes
 from ctypes import wintypes
 import re
-from typing import List, Any
+from typing import List, Any, Dict
 from utils import logger
 import hid
 from video import VideoFFmpeg
@@ -9,8 +9,9 @@ from device.AbstractDeviceManager import AbstractDeviceManager, AbstractHotplugM
 import serial.tools.list_ports
 import time
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-import copy
+from operator import itemgetter
 
 CoreLogger = logger.core_logger
 
@@ -21,12 +22,46 @@ _hotplug_monitoring = False
 _hotplug_thread = None
 _hotplug_callbacks = []
 
+# Per-thread scratch buffers for SetupAPI/CfgMgr32 string queries
+_tls = threading.local()
+
+# Child device classification: a hardware ID containing HID wins over MI_00 (camera),
+# which wins over Audio. The group names are the device_hardware_info keys.
+# (hardware ID marker, info key, DeviceInfo attribute); the first marker found wins
+_CHILD_CLASSES = (
+    ("HID", "HID", "hid_device"),
+    ("MI_00", "camera", "camera_device"),
+    ("Audio", "audio", "audio_device"),
+)
+# Interfaces &0002 / &0004 are skipped when classifying children
+_EXCLUDED_CHILD_RE = re.compile(r"&000[24]")
+# USBROOT(n) and USB(port) elements of a DEVPKEY_Device_LocationPaths entry
+_LOCATION_PATH_RE = re.compile(r"USBROOT\((\d+)\)|#USB\((\d+)\)")
+
+def _classify_child(hardware_id):
+    """Return the first _CHILD_CLASSES entry whose marker appears in hardware_id"""
+    for child_class in _CHILD_CLASSES:
+        if child_class[0] in hardware_id:
+            return child_class
+    return None
+
 # Constants
 DIGCF_PRESENT = 0x00000002
 DIGCF_DEVICEINTERFACE = 0x00000010
-DIGCF_ALLCLASSES = 0x00000004
 SPDRP_HARDWAREID = 0x00000001
+CM_DRP_HARDWAREID = 0x00000001
+CM_GETIDLIST_FILTER_ENUMERATOR = 0x00000001
+CM_GETIDLIST_FILTER_PRESENT = 0x00000100
+CM_LOCATE_DEVNODE_NORMAL = 0x00000000
 ERROR_NO_MORE_ITEMS = 259
+ERROR_INSUFFICIENT_BUFFER = 122
+MAX_DEVICE_ID_LEN = 200
+CM_NOTIFY_FILTER_FLAG_ALL_INTERFACE_CLASSES = 0x00000001
+CM_NOTIFY_FILTER_TYPE_DEVICEINTERFACE = 0
+CM_NOTIFY_ACTION_DEVICEINTERFACEARRIVAL = 0
+CM_NOTIFY_ACTION_DEVICEINTERFACEREMOVAL = 1
+# Offset of DeviceInterface.SymbolicLink in CM_NOTIFY_EVENT_DATA (FilterType, Reserved, ClassGuid)
+CM_NOTIFY_EVENT_DATA_SYMBOLIC_LINK_OFFSET = 24
 
 # Structures
 class GUID(ctypes.Structure):
@@ -45,8 +80,34 @@ class SP_DEVINFO_DATA(ctypes.Structure):
         ("Reserved", ctypes.c_void_p),
     ]
 
+class DEVPROPKEY(ctypes.Structure):
+    _fields_ = [
+        ("fmtid", GUID),
+        ("pid", wintypes.ULONG),
+    ]
+
+class _CM_NOTIFY_FILTER_UNION(ctypes.Union):
+    _fields_ = [
+        ("ClassGuid", GUID),
+        ("hTarget", wintypes.HANDLE),
+        ("InstanceId", wintypes.WCHAR * MAX_DEVICE_ID_LEN),
+    ]
+
+class CM_NOTIFY_FILTER(ctypes.Structure):
+    _fields_ = [
+        ("cbSize", wintypes.DWORD),
+        ("Flags", wintypes.DWORD),
+        ("FilterType", ctypes.c_int),
+        ("Reserved", wintypes.DWORD),
+        ("u", _CM_NOTIFY_FILTER_UNION),
+    ]
+
+CM_NOTIFY_CALLBACK = ctypes.WINFUNCTYPE(
+    wintypes.DWORD, wintypes.HANDLE, ctypes.c_void_p, ctypes.c_int, ctypes.c_void_p, wintypes.DWORD
+)
+
 # Load DLLs
-setupapi = ctypes.WinDLL('setupapi')
+setupapi = ctypes.WinDLL('setupapi', use_last_error=True)
 cfgmgr32 = ctypes.WinDLL('cfgmgr32')
 
 # SetupAPI functions
@@ -82,12 +143,63 @@ CM_Get_Child = cfgmgr32.CM_Get_Child
 CM_Get_Child.argtypes = [ctypes.POINTER(wintypes.DWORD), wintypes.DWORD, wintypes.ULONG]
 CM_Get_Child.restype = wintypes.DWORD
 
+CM_Get_Sibling = cfgmgr32.CM_Get_Sibling
+CM_Get_Sibling.argtypes = [ctypes.POINTER(wintypes.DWORD), wintypes.DWORD, wintypes.ULONG]
+CM_Get_Sibling.restype = wintypes.DWORD
+
+CM_Get_DevNode_Registry_Property = cfgmgr32.CM_Get_DevNode_Registry_PropertyW
+CM_Get_DevNode_Registry_Property.argtypes = [
+    wintypes.DWORD, wintypes.ULONG, ctypes.POINTER(wintypes.ULONG),
+    ctypes.c_void_p, ctypes.POINTER(wintypes.ULONG), wintypes.ULONG
+]
+CM_Get_DevNode_Registry_Property.restype = wintypes.DWORD
+
+CM_Get_Device_ID_List_Size = cfgmgr32.CM_Get_Device_ID_List_SizeW
+CM_Get_Device_ID_List_Size.argtypes = [ctypes.POINTER(wintypes.ULONG), wintypes.LPCWSTR, wintypes.ULONG]
+CM_Get_Device_ID_List_Size.restype = wintypes.DWORD
+
+CM_Get_Device_ID_List = cfgmgr32.CM_Get_Device_ID_ListW
+CM_Get_Device_ID_List.argtypes = [wintypes.LPCWSTR, ctypes.POINTER(wintypes.WCHAR), wintypes.ULONG, wintypes.ULONG]
+CM_Get_Device_ID_List.restype = wintypes.DWORD
+
+CM_Locate_DevNode = cfgmgr32.CM_Locate_DevNodeW
+CM_Locate_DevNode.argtypes = [ctypes.POINTER(wintypes.DWORD), wintypes.LPCWSTR, wintypes.ULONG]
+CM_Locate_DevNode.restype = wintypes.DWORD
+
+CM_Get_DevNode_Property = cfgmgr32.CM_Get_DevNode_PropertyW
+CM_Get_DevNode_Property.argtypes = [
+    wintypes.DWORD, ctypes.POINTER(DEVPROPKEY), ctypes.POINTER(wintypes.ULONG),
+    ctypes.c_void_p, ctypes.POINTER(wintypes.ULONG), wintypes.ULONG
+]
+CM_Get_DevNode_Property.restype = wintypes.DWORD
+
+# Device change notifications (Windows 8 and later)
+try:
+    CM_Register_Notification = cfgmgr32.CM_Register_Notification
+    CM_Register_Notification.argtypes = [
+        ctypes.POINTER(CM_NOTIFY_FILTER), ctypes.c_void_p, CM_NOTIFY_CALLBACK, ctypes.POINTER(wintypes.HANDLE)
+    ]
+    CM_Register_Notification.restype = wintypes.DWORD
+
+    CM_Unregister_Notification = cfgmgr32.CM_Unregister_Notification
+    CM_Unregister_Notification.argtypes = [wintypes.HANDLE]
+    CM_Unregister_Notification.restype = wintypes.DWORD
+except AttributeError:
+    CM_Register_Notification = None
+    CM_Unregister_Notification = None
+
 # USB Device Interface GUID
 GUID_DEVINTERFACE_USB_DEVICE = GUID(
     0xA5DCBF10, 0x6530, 0x11D2,
     (ctypes.c_ubyte * 8)(0x90, 0x1F, 0x00, 0xC0, 0x4F, 0xB9, 0x51, 0xED)
 )
 
+DEVPKEY_Device_LocationPaths = DEVPROPKEY(
+    GUID(0xA45C254E, 0xDF1C, 0x4EFD,
+         (ctypes.c_ubyte * 8)(0x80, 0x20, 0x67, 0xD1, 0x46, 0xA8, 0x50, 0xE0)),
+    37
+)
+
 def get_device_parent(dev_inst):
     """Get the direct parent device instance."""
     parent_dev_inst = wintypes.DWORD()
@@ -96,75 +208,160 @@ def get_device_parent(dev_inst):
     return None
 
 def get_device_id(dev_inst):
-    buffer = (wintypes.WCHAR * 256)()
+    # Device instance IDs are capped at MAX_DEVICE_ID_LEN (200), so one buffer per thread always fits
+    buffer = getattr(_tls, 'devid_buf', None)
+    if buffer is None:
+        buffer = _tls.devid_buf = (wintypes.WCHAR * 256)()
     if CM_Get_Device_ID(dev_inst, buffer, 256, 0) == 0:
         return ctypes.wstring_at(buffer)
     return "Unknown"
 
 def get_hardware_id(hDevInfo, dev_info_data):
-    buffer_size = wintypes.DWORD(0)
-    SetupDiGetDeviceRegistryProperty(
+    # Reuse one buffer per thread; hardware IDs almost always fit in 512 wchars,
+    # so the common path is a single SetupAPI call with no size probe
+    buffer = getattr(_tls, 'hwid_buf', None)
+    if buffer is None:
+        buffer = _tls.hwid_buf = (ctypes.c_wchar * 512)()
+
+    required_size = wintypes.DWORD(0)
+    if SetupDiGetDeviceRegistryProperty(
         hDevInfo, ctypes.byref(dev_info_data), SPDRP_HARDWAREID,
-        None, None, 0, ctypes.byref(buffer_size)
-    )
+        None, buffer, ctypes.sizeof(buffer), ctypes.byref(required_size)
+    ):
+        return ctypes.wstring_at(buffer)
 
-    if ctypes.get_last_error() == ERROR_NO_MORE_ITEMS:
+    if ctypes.get_last_error() != ERROR_INSUFFICIENT_BUFFER:
         return "Unknown"
 
-    buffer = (ctypes.c_wchar * max(256, buffer_size.value // 2))()
-    reg_data_type = wintypes.DWORD()
+    # required_size is in bytes; grow the thread's buffer and retry once
+    buffer = _tls.hwid_buf = (ctypes.c_wchar * (required_size.value // ctypes.sizeof(ctypes.c_wchar) + 1))()
     if SetupDiGetDeviceRegistryProperty(
         hDevInfo, ctypes.byref(dev_info_data), SPDRP_HARDWAREID,
-        ctypes.byref(reg_data_type), ctypes.byref(buffer), ctypes.sizeof(buffer),
-        ctypes.byref(buffer_size)
+        None, buffer, ctypes.sizeof(buffer), ctypes.byref(required_size)
     ):
-        return ctypes.wstring_at(ctypes.addressof(buffer))
+        return ctypes.wstring_at(buffer)
     return "Unknown"
 
+def iter_children(parent_dev_inst):
+    """Yield the DEVINST of each direct child of a device node."""
+    child_dev_inst = wintypes.DWORD()
+    if CM_Get_Child(ctypes.byref(child_dev_inst), parent_dev_inst, 0) != 0:
+        return
+    while True:
+        yield child_dev_inst.value
+        next_dev_inst = wintypes.DWORD()
+        if CM_Get_Sibling(ctypes.byref(next_dev_inst), child_dev_inst.value, 0) != 0:
+            break
+        child_dev_inst = next_dev_inst
+
 def get_sibling_devices_by_parent(parent_dev_inst):
     siblings = []
+    for dev_inst in iter_children(parent_dev_inst):
+        hwid = get_hardware_id_from_devinst(dev_inst)
+        dev_id = get_device_id(dev_inst)
+        siblings.append({"hardware_id": hwid, "device_id": dev_id})
+    return siblings
 
-    # Create a new device info set for all classes to enumerate devices
-    hDevInfo = SetupDiGetClassDevs(None, None, None, DIGCF_PRESENT | DIGCF_ALLCLASSES)
-    if hDevInfo == wintypes.HANDLE(-1).value:
+def get_device_location(dev_inst):
+    """
+    Return the USB location of a device node in pyserial's format (e.g. "1-4" or "1-4.2"),
+    parsed from DEVPKEY_Device_LocationPaths such as "PCIROOT(0)#PCI(1400)#USBROOT(0)#USB(4)".
+    """
+    buffer = (ctypes.c_wchar * 512)()
+    buffer_size = wintypes.ULONG(ctypes.sizeof(buffer))
+    prop_type = wintypes.ULONG()
+    if CM_Get_DevNode_Property(
+        dev_inst, ctypes.byref(DEVPKEY_Device_LocationPaths), ctypes.byref(prop_type),
+        buffer, ctypes.byref(buffer_size), 0
+    ) != 0:
+        return ""
+
+    # Same construction as pyserial's Windows port location, so the result
+    # compares directly with ListPortInfo.location
+    location = ""
+    for match in _LOCATION_PATH_RE.finditer(ctypes.wstring_at(buffer)):
+        if match.group(1) is not None:
+            location += str(int(match.group(1)) + 1)
+        else:
+            location += ("." if "-" in location else "-") + match.group(2)
+    return location
+
+def get_port_chain(dev_inst):
+    """Return the port chain of the Openterface serial port, which sits on port 2 of the device's hub."""
+    parent_dev_inst = get_device_parent(dev_inst)
+    if parent_dev_inst is None:
+        return ""
+    return get_hub_port_chain(parent_dev_inst)
+
+def get_hub_port_chain(hub_dev_inst):
+    """Same as get_port_chain, for callers that already hold the parent hub's DevInst."""
+    hub_location = get_device_location(hub_dev_inst)
+    return f"{hub_location}.2" if hub_location else ""
+
+def get_usb_device_info(dev_inst):
+    """Collect port chain, siblings and children for a USB device node."""
+    parent_dev_inst = get_device_parent(dev_inst)
+    if parent_dev_inst is None:
+        return None
+    return {
+        "port_chain": get_hub_port_chain(parent_dev_inst),
+        "siblings": get_sibling_devices_by_parent(parent_dev_inst),
+        "children": get_child_devices(dev_inst)
+    }
+
+def get_device_ids_by_enumerator(enumerator_filter):
+    """Return the instance IDs of present devices under an enumerator filter such as USB\\VID_xxxx&PID_yyyy."""
+    flags = CM_GETIDLIST_FILTER_ENUMERATOR | CM_GETIDLIST_FILTER_PRESENT
+    list_size = wintypes.ULONG()
+    if CM_Get_Device_ID_List_Size(ctypes.byref(list_size), enumerator_filter, flags) != 0 or list_size.value <= 1:
+        return []
+
+    buffer = (ctypes.c_wchar * list_size.value)()
+    if CM_Get_Device_ID_List(enumerator_filter, buffer, list_size.value, flags) != 0:
         return []
 
+    # Double-null-terminated list of instance IDs
+    return [dev_id for dev_id in buffer[:].split('\0') if dev_id]
+
+def collect_usb_device_set(hDevInfo, target_hwid=None):
+    """
+    Build port chain/sibling/child info for every device in a device info set.
+    When target_hwid is given, devices whose hardware ID does not contain it are skipped.
+    """
+    result = []
     try:
         dev_info_data = SP_DEVINFO_DATA()
         dev_info_data.cbSize = ctypes.sizeof(SP_DEVINFO_DATA)
         index = 0
 
         while SetupDiEnumDeviceInfo(hDevInfo, index, ctypes.byref(dev_info_data)):
-            current_parent = wintypes.DWORD()
-            if CM_Get_Parent(ctypes.byref(current_parent), dev_info_data.DevInst, 0) == 0:
-                if current_parent.value == parent_dev_inst:
-                    hwid = get_hardware_id(hDevInfo, dev_info_data)
-                    dev_id = get_device_id(dev_info_data.DevInst)
-                    siblings.append({"hardware_id": hwid, "device_id": dev_id})
+            if target_hwid is None or target_hwid in get_hardware_id(hDevInfo, dev_info_data).upper():
+                device = get_usb_device_info(dev_info_data.DevInst)
+                if device is not None:
+                    result.append(device)
             index += 1
     finally:
         SetupDiDestroyDeviceInfoList(hDevInfo)
 
-    return siblings
-
-def get_port_chain(dev_inst):
-    port_chain = []
-    depth = 0
-    while dev_inst and depth < 3:  # Limit to 3 levels
-        dev_id = get_device_id(dev_inst)
-        port_chain.append(dev_id)
-        parent = wintypes.DWORD()
-        if CM_Get_Parent(ctypes.byref(parent), dev_inst, 0) != 0:
-            break
-        dev_inst = parent.value
-        depth += 1
-    port_chain.reverse()
-    return port_chain
+    return result
 
 def find_usb_devices_with_vid_pid(vid, pid):
     target_hwid = f"VID_{vid.upper()}&PID_{pid.upper()}"
     result = []
 
+    # Ask CfgMgr32 for the matching instance IDs and open each devnode directly,
+    # without building a SetupAPI device info set
+    for instance_id in get_device_ids_by_enumerator(f"USB\\{target_hwid}"):
+        dev_inst = wintypes.DWORD()
+        if CM_Locate_DevNode(ctypes.byref(dev_inst), instance_id, CM_LOCATE_DEVNODE_NORMAL) != 0:
+            continue
+        device = get_usb_device_info(dev_inst.value)
+        if device is not None:
+            result.append(device)
+    if result:
+        return result
+
+    # Fallback: enumerate every USB device interface and match the hardware ID
     hDevInfo = SetupDiGetClassDevs(
         ctypes.byref(GUID_DEVINTERFACE_USB_DEVICE), None, None,
         DIGCF_PRESENT | DIGCF_DEVICEINTERFACE
@@ -172,72 +369,39 @@ def find_usb_devices_with_vid_pid(vid, pid):
     if hDevInfo == wintypes.HANDLE(-1).value:
         raise ctypes.WinError()
 
-    try:
-        dev_info_data = SP_DEVINFO_DATA()
-        dev_info_data.cbSize = ctypes.sizeof(SP_DEVINFO_DATA)
-        index = 0
-
-        while SetupDiEnumDeviceInfo(hDevInfo, index, ctypes.byref(dev_info_data)):
-            hwid = get_hardware_id(hDevInfo, dev_info_data)
-            if target_hwid in hwid.upper():
-                parent_dev_inst = get_device_parent(dev_info_data.DevInst)
-                if parent_dev_inst is not None:
-                    port_chain = get_port_chain(dev_info_data.DevInst)
-                    siblings = get_sibling_devices_by_parent(parent_dev_inst)
-                    children = get_child_devices(dev_info_data.DevInst)
-                    result.append({
-                        "port_chain": port_chain,
-                        "siblings": siblings,
-                        "children": children
-                    })
-            index += 1
-    finally:
-        SetupDiDestroyDeviceInfoList(hDevInfo)
+    return collect_usb_device_set(hDevInfo, target_hwid)
 
-    return result
+def iter_descendants(dev_inst):
+    """Yield the DEVINST of every descendant of a device node, depth-first in pre-order."""
+    # Explicit stack of child iterators instead of recursion
+    stack = [iter_children(dev_inst)]
+    while stack:
+        for child_dev_inst in stack[-1]:
+            yield child_dev_inst
+            stack.append(iter_children(child_dev_inst))
+            break
+        else:
+            stack.pop()
 
 def get_child_devices(dev_inst):
-    children = []
-
-    child_dev_inst = wintypes.DWORD()
-    if CM_Get_Child(ctypes.byref(child_dev_inst), dev_inst, 0) == 0:
-        while True:
-            hwid = get_hardware_id_from_devinst(child_dev_inst.value)
-            dev_id = get_device_id(child_dev_inst.value)
-            children.append({"hardware_id": hwid, "device_id": dev_id})
-
-            next_child_dev_inst = wintypes.DWORD()
-            if CM_Get_Sibling(ctypes.byref(next_child_dev_inst), child_dev_inst.value, 0) != 0:
-                break
-            child_dev_inst = next_child_dev_inst
-
-            grandchildren = get_child_devices(child_dev_inst.value)
-            children.extend(grandchildren)
-
-    return children
+    return [
+        {"hardware_id": get_hardware_id_from_devinst(child_dev_inst), "device_id": get_device_id(child_dev_inst)}
+        for child_dev_inst in iter_descendants(dev_inst)
+    ]
 
 def get_hardware_id_from_devinst(dev_inst):
-    hDevInfo = SetupDiGetClassDevs(None, None, None, DIGCF_PRESENT | DIGCF_ALLCLASSES)
-    if hDevInfo == wintypes.HANDLE(-1).value:
-        return "Unknown"
-
-    try:
-        dev_info_data = SP_DEVINFO_DATA()
-        dev_info_data.cbSize = ctypes.sizeof(SP_DEVINFO_DATA)
-        index = 0
-
-        while SetupDiEnumDeviceInfo(hDevInfo, index, ctypes.byref(dev_info_data)):
-            if dev_info_data.DevInst == dev_inst:
-                return get_hardware_id(hDevInfo, dev_info_data)
-            index += 1
-    finally:
-        SetupDiDestroyDeviceInfoList(hDevInfo)
-
+    """Read the hardware ID straight from the devnode, without enumerating a device info set."""
+    buffer = getattr(_tls, 'hwid_buf', None)
+    if buffer is None:
+        buffer = _tls.hwid_buf = (ctypes.c_wchar * 512)()
+    buffer_size = wintypes.ULONG(ctypes.sizeof(buffer))
+    if CM_Get_DevNode_Registry_Property(
+        dev_inst, CM_DRP_HARDWAREID, None,
+        buffer, ctypes.byref(buffer_size), 0
+    ) == 0:
+        return ctypes.wstring_at(buffer)
     return "Unknown"
 
-def CM_Get_Sibling(dnDevInstSibling, dnDevInstDev, ulFlags):
-    return cfgmgr32.CM_Get_Sibling(dnDevInstSibling, dnDevInstDev, ulFlags)
-
 def collect_device_ids(Serial_vid, Serial_pid, HID_vid, HID_pid):
     """
     According VID/PID find physical device, collect serial_port、HID、camera、audio device id
@@ -246,8 +410,10 @@ def collect_device_ids(Serial_vid, Serial_pid, HID_vid, HID_pid):
     devices = find_usb_devices_with_vid_pid(HID_vid, HID_pid)
     device_info_list = []
     if devices:
+        serial_vid_upper = Serial_vid.upper()
+        serial_pid_upper = Serial_pid.upper()
         for i, device in enumerate(devices, 1):
-            port_chain = ""
+            port_chain = device["port_chain"]
             device_hardware_info = {
                 "serial_port": "",
                 "serial_port_path": "",
@@ -258,42 +424,29 @@ def collect_device_ids(Serial_vid, Serial_pid, HID_vid, HID_pid):
                 "audio": "",
                 "audio_path": ""
             }
-            CoreLogger.info(f"Device {i} Port Chain:")
-            tmp = ""
-            for j, dev_id in enumerate(device["port_chain"], 1):
-                CoreLogger.info(f"{j}. {dev_id}")
-                if j ==1:
-                    tmp = str(int(dev_id[-1])+1) + "-"
-                if j==2:
-                    port_chain = tmp + dev_id[-1]
-                if 2 < j < len(device["port_chain"]):
-                    port_chain += f"-{dev_id[-1]}"
-                if j == len(device["port_chain"]):
-                    port_chain += f".2"
-                
+            CoreLogger.info("Device %s Port Chain: %s", i, port_chain)
+
             # CoreLogger.info(f"Device {i} Serial port (same parent):")
             if device["siblings"]:
                 for k, sibling in enumerate(device["siblings"], 1):
-                    if Serial_vid.upper() in sibling['hardware_id'] and Serial_pid.upper() in sibling['hardware_id']:
+                    hardware_id = sibling['hardware_id'].upper()
+                    if serial_vid_upper in hardware_id and serial_pid_upper in hardware_id:
                         device_hardware_info["serial_port"] = sibling['device_id']
                         device_hardware_info["serial_port_path"] = port_chain
-                        CoreLogger.info(f"{k}. Hardware ID: {sibling['hardware_id']}")
-                        CoreLogger.info(f"   Device ID: {sibling['device_id']}")
-                        CoreLogger.info(f" Device location: {port_chain}")
+                        CoreLogger.info("%s. Hardware ID: %s", k, sibling['hardware_id'])
+                        CoreLogger.info("   Device ID: %s", sibling['device_id'])
+                        CoreLogger.info(" Device location: %s", port_chain)
             else:
                 CoreLogger.info("No siblings found.")
             # CoreLogger.info(f"Device {i} Openterface child devices:")
             if device["children"]:
                 for l, child in enumerate(device["children"], 1):
-                    if not ("&0002" in child['device_id'] or "&0004" in child['device_id']):
-                        CoreLogger.info(f"{l}. Hardware ID: {child['hardware_id']}")
-                        CoreLogger.info(f"   Device ID: {child['device_id']} (type: {type(child['device_id'])})")
-                        if "HID" in child['hardware_id']:
-                            device_hardware_info["HID"] = child['device_id']
-                        elif "MI_00" in child['hardware_id']:
-                            device_hardware_info["camera"] = child['device_id']
-                        elif "Audio" in child['hardware_id']:
-                            device_hardware_info["audio"] = child['device_id']
+                    if not _EXCLUDED_CHILD_RE.search(child['device_id']):
+                        CoreLogger.info("%s. Hardware ID: %s", l, child['hardware_id'])
+                        CoreLogger.info("   Device ID: %s (type: %s)", child['device_id'], type(child['device_id']))
+                        child_class = _classify_child(child['hardware_id'])
+                        if child_class:
+                            device_hardware_info[child_class[1]] = child['device_id']
             else:
                 CoreLogger.info("No children found.")
             device_info_list.append(device_hardware_info)
@@ -301,69 +454,89 @@ def collect_device_ids(Serial_vid, Serial_pid, HID_vid, HID_pid):
         CoreLogger.info("No devices found with the specified VID and PID.")
     return device_info_list
 
-def find_com_port_by_device_location(device_path):
-    ports = serial.tools.list_ports.comports()
+def find_com_port_by_device_location(device_path, ports):
     for port in ports:
         if port.location == device_path:
             return port.name
 
-def find_HID_by_device_id(device_id):
-    InstanceID = device_id.split('\\')[-1]
-    for device in hid.enumerate():
-        path_str = device['path'].decode(errors='replace')
-        if InstanceID.lower() in path_str:
-            return device['path']
-
-def find_camera_audio_by_device_info(device_info):
-    devs = VideoFFmpeg.list_windows_devices()
+def find_HID_by_device_id(device_id, hid_devices=None):
+    """
+    Find the HID path whose interface path contains the device's instance ID.
+    hid_devices is an optional hid.enumerate() result shared across a discovery pass.
+    """
+    instance_lower = device_id.split('\\')[-1].lower()
+    if hid_devices is None:
+        hid_devices = hid.enumerate()
+    for device in hid_devices:
+        path = device['path']
+        if instance_lower in path.decode(errors='replace').lower():
+            return path
+
+def find_camera_audio_by_device_info(device_info, devs):
+    """devs is the DirectShow index from VideoFFmpeg.index_windows_devices()"""
     camera_id = device_info['camera'].split('\\')[-1]
     audio_id = device_info['audio'].rsplit('.', 1)[-1]
-    camera_path = ""
-    audio_path = ""
-    for i, dev in enumerate(devs):
-        if camera_id.lower() in dev:
-            camera_path = dev
-        if audio_id in dev:
-            audio_path = dev
-    return camera_path, audio_path
-
-def match_device_path(device_info):
+    return devs.get(camera_id.lower(), ""), devs.get(audio_id.lower(), "")
+
+def match_device_path(device_info, devs, ports, hid_devices=None):
     """
     Match the device path based on the device ID.
+    devs is the DirectShow index from VideoFFmpeg.index_windows_devices(),
+    ports the COM port list from serial.tools.list_ports.comports() and
+    hid_devices the HID list from hid.enumerate().
     This function is a placeholder and should be implemented based on specific requirements.
     """
     # Placeholder implementation
     if device_info['serial_port']:
-        device_info['serial_port_path'] = find_com_port_by_device_location(device_info['serial_port_path'])
-        CoreLogger.info(f"Matched Serial Port Path: {device_info['serial_port_path']}")
+        device_info['serial_port_path'] = find_com_port_by_device_location(device_info['serial_port_path'], ports)
+        CoreLogger.info("Matched Serial Port Path: %s", device_info['serial_port_path'])
     if device_info["HID"]:
-        device_info['HID_path'] = find_HID_by_device_id(device_info["HID"])
-        CoreLogger.info(f"Matched HID Path: {device_info['HID_path']}")
+        device_info['HID_path'] = find_HID_by_device_id(device_info["HID"], hid_devices)
+        CoreLogger.info("Matched HID Path: %s", device_info['HID_path'])
     if device_info['camera'] and device_info['audio']:
-        device_info['camera_path'], device_info['audio_path'] = find_camera_audio_by_device_info(device_info)
-        CoreLogger.info(f"Matched camera Path: {device_info['camera_path']}")
-        CoreLogger.info(f"Matched audio Path: {device_info['audio_path']}")
+        device_info['camera_path'], device_info['audio_path'] = find_camera_audio_by_device_info(device_info, devs)
+        CoreLogger.info("Matched camera Path: %s", device_info['camera_path'])
+        CoreLogger.info("Matched audio Path: %s", device_info['audio_path'])
+
+def list_system_devices():
+    """
+    Take the DirectShow, COM port and HID listings used to resolve device paths.
+    They come from independent subsystems, so the three queries run concurrently.
+    """
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        devs_future = executor.submit(lambda: VideoFFmpeg.index_windows_devices(VideoFFmpeg.list_windows_devices()))
+        ports_future = executor.submit(lambda: list(serial.tools.list_ports.comports()))
+        hid_future = executor.submit(hid.enumerate)
+        return devs_future.result(), ports_future.result(), hid_future.result()
 
 def search_phycial_device(SerialVid, SerialPID, HIDVID, HIDPID):
     device_info_list = collect_device_ids(SerialVid, SerialPID, HIDVID, HIDPID)
+    if not device_info_list:
+        return device_info_list
+    # The DirectShow, COM port and HID listings are the same for every device, so take them once per search
+    devs, ports, hid_devices = list_system_devices()
     for device_info in device_info_list:
-        match_device_path(device_info)
+        match_device_path(device_info, devs, ports, hid_devices)
     return device_info_list
 
 class WindowsDeviceManager(AbstractDeviceManager):
     """Windows implementation of the abstract device manager"""
     
-    def __init__(self, serial_vid: str, serial_pid: str, hid_vid: str, hid_pid: str):
-        super().__init__(serial_vid, serial_pid, hid_vid, hid_pid)
+    def __init__(self, serial_vid: str, serial_pid: str, hid_vid: str, hid_pid: str,
+                 cache_ttl: float = 0.5):
+        super().__init__(serial_vid, serial_pid, hid_vid, hid_pid, cache_ttl)
     
-    def discover_devices(self) -> List[DeviceInfo]:
+    def _discover_devices_impl(self) -> List[DeviceInfo]:
         """Discover all devices matching the specified VID/PID on Windows"""
         device_info_list = []
         devices = find_usb_devices_with_vid_pid(self.hid_vid, self.hid_pid)
         
         if devices:
+            devs, ports, hid_devices = list_system_devices()
+            serial_vid_upper = self.serial_vid.upper()
+            serial_pid_upper = self.serial_pid.upper()
             for i, device in enumerate(devices, 1):
-                port_chain = self._build_port_chain(device["port_chain"])
+                port_chain = device["port_chain"]
                 
                 device_info = DeviceInfo(
                     port_chain=port_chain,
@@ -373,23 +546,21 @@ class WindowsDeviceManager(AbstractDeviceManager):
                 # Process siblings (serial ports)
                 if device["siblings"]:
                     for sibling in device["siblings"]:
-                        if self.serial_vid.upper() in sibling['hardware_id'] and self.serial_pid.upper() in sibling['hardware_id']:
+                        hardware_id = sibling['hardware_id'].upper()
+                        if serial_vid_upper in hardware_id and serial_pid_upper in hardware_id:
                             device_info.serial_port = sibling['device_id']
                             device_info.serial_port_path = port_chain
                 
                 # Process children (HID, camera, audio)
                 if device["children"]:
                     for child in device["children"]:
-                        if not ("&0002" in child['device_id'] or "&0004" in child['device_id']):
-                            if "HID" in child['hardware_id']:
-                                device_info.hid_device = child['device_id']
-                            elif "MI_00" in child['hardware_id']:
-                                device_info.camera_device = child['device_id']
-                            elif "Audio" in child['hardware_id']:
-                                device_info.audio_device = child['device_id']
+                        if not _EXCLUDED_CHILD_RE.search(child['device_id']):
+                            child_class = _classify_child(child['hardware_id'])
+                            if child_class:
+                                setattr(device_info, child_class[2], child['device_id'])
                 
                 # Match device paths
-                self._match_device_paths(device_info)
+                self._match_device_paths(device_info, devs, ports, hid_devices)
                 device_info_list.append(device_info)
         
         return device_info_list
@@ -398,45 +569,26 @@ class WindowsDeviceManager(AbstractDeviceManager):
         """Get the port chain for a Windows device instance"""
         if isinstance(device_identifier, int):
             # Assume it's a device instance
-            return self._build_port_chain(get_port_chain(device_identifier))
+            return get_port_chain(device_identifier)
         return str(device_identifier)
     
-    def _build_port_chain(self, raw_port_chain: list) -> str:
-        """Build a formatted port chain string from raw Windows data"""
-        if not raw_port_chain:
-            return ""
-        
-        port_chain = ""
-        tmp = ""
-        
-        for j, dev_id in enumerate(raw_port_chain, 1):
-            if j == 1:
-                tmp = str(int(dev_id[-1]) + 1) + "-"
-            if j == 2:
-                port_chain = tmp + dev_id[-1]
-            if 2 < j < len(raw_port_chain):
-                port_chain += f"-{dev_id[-1]}"
-            if j == len(raw_port_chain):
-                port_chain += ".2"
-        
-        return port_chain
-    
-    def _match_device_paths(self, device_info: DeviceInfo):
+    def _match_device_paths(self, device_info: DeviceInfo, devs: Dict[str, str], ports: List[Any],
+                            hid_devices: List[Dict[str, Any]]):
         """Match Windows device paths for the device"""
         # Match serial port
         if device_info.serial_port:
-            device_info.serial_port_path = find_com_port_by_device_location(device_info.port_chain)
+            device_info.serial_port_path = find_com_port_by_device_location(device_info.port_chain, ports)
         
         # Match HID path
         if device_info.hid_device:
-            device_info.hid_path = find_HID_by_device_id(device_info.hid_device)
+            device_info.hid_path = find_HID_by_device_id(device_info.hid_device, hid_devices)
         
         # Match camera and audio paths
         if device_info.camera_device and device_info.audio_device:
             camera_path, audio_path = find_camera_audio_by_device_info({
                 'camera': device_info.camera_device,
                 'audio': device_info.audio_device
-            })
+            }, devs)
             device_info.camera_path = camera_path
             device_info.audio_path = audio_path
 
@@ -444,8 +596,81 @@ class WindowsDeviceManager(AbstractDeviceManager):
 class WindowsHotplugMonitor(AbstractHotplugMonitor):
     """Windows implementation of the abstract hotplug monitor"""
     
-    def __init__(self, device_manager: WindowsDeviceManager, poll_interval: float = 2.0):
-        super().__init__(device_manager, poll_interval)
+    def __init__(self, device_manager: WindowsDeviceManager, poll_interval: float = 2.0,
+                 warm_start: bool = False):
+        super().__init__(device_manager, poll_interval, warm_start)
+        self._device_event = threading.Event()
+        self._notify_handle = None
+        self._notify_callback = None
+        # Interface symbolic links of our devices contain one of these
+        self._vid_markers = tuple({f"vid_{vid.lower()}" for vid in (device_manager.serial_vid, device_manager.hid_vid)})
+    
+    def start_monitoring(self, wait: bool = True):
+        """Start monitoring for device changes"""
+        if not self.running:
+            # Register before the initial snapshot so no change falls between the two
+            self._register_notification()
+        super().start_monitoring(wait)
+    
+    def stop_monitoring(self):
+        """Stop monitoring for device changes"""
+        super().stop_monitoring()
+        self._unregister_notification()
+    
+    def _register_notification(self):
+        """Subscribe to device interface arrival/removal; on failure the monitor keeps polling"""
+        if CM_Register_Notification is None or self._notify_handle is not None:
+            return
+        notify_filter = CM_NOTIFY_FILTER()
+        notify_filter.cbSize = ctypes.sizeof(CM_NOTIFY_FILTER)
+        notify_filter.Flags = CM_NOTIFY_FILTER_FLAG_ALL_INTERFACE_CLASSES
+        notify_filter.FilterType = CM_NOTIFY_FILTER_TYPE_DEVICEINTERFACE
+        # Keep a reference: the callback must outlive the registration
+        self._notify_callback = CM_NOTIFY_CALLBACK(self._on_device_notification)
+        handle = wintypes.HANDLE()
+        result = CM_Register_Notification(ctypes.byref(notify_filter), None, self._notify_callback, ctypes.byref(handle))
+        if result != 0:
+            CoreLogger.warning(f"CM_Register_Notification failed ({result}), falling back to polling")
+            self._notify_callback = None
+            return
+        self._notify_handle = handle
+    
+    def _unregister_notification(self):
+        if self._notify_handle is not None:
+            CM_Unregister_Notification(self._notify_handle)
+            self._notify_handle = None
+            self._notify_callback = None
+    
+    def _on_device_notification(self, notify_handle, context, action, event_data, event_data_size):
+        """Runs on a system thread pool thread for every device interface change"""
+        if action in (CM_NOTIFY_ACTION_DEVICEINTERFACEARRIVAL, CM_NOTIFY_ACTION_DEVICEINTERFACEREMOVAL) and event_data:
+            symbolic_link = ctypes.wstring_at(event_data + CM_NOTIFY_EVENT_DATA_SYMBOLIC_LINK_OFFSET).lower()
+            if any(marker in symbolic_link for marker in self._vid_markers):
+                self._device_event.set()
+        return 0
+    
+    @property
+    def uses_device_events(self) -> bool:
+        return self._notify_handle is not None
+    
+    def _wait_for_device_event(self, timeout: float) -> bool:
+        """Wait for one of our devices to add or remove an interface"""
+        if self._notify_handle is None:
+            return super()._wait_for_device_event(timeout)
+        if not self._device_event.wait(timeout) or not self.running:
+            return False
+        # A device brings up its serial, HID, camera and audio interfaces one after another
+        deadline = time.monotonic() + self._debounce_max
+        self._device_event.clear()
+        while True:
+            wait_time = self._debounce_wait_time(deadline)
+            if wait_time <= 0 or not self._device_event.wait(wait_time):
+                return True
+            self._device_event.clear()
+    
+    def _wake_monitor_thread(self):
+        super()._wake_monitor_thread()
+        self._device_event.set()
     
     def _create_monitor_thread(self):
         """Create the Windows monitoring thread"""
@@ -455,15 +680,16 @@ class WindowsHotplugMonitor(AbstractHotplugMonitor):
         """Main monitoring loop for Windows"""
         while self.running:
             try:
+                # Wait for a device notification (or the next poll)
+                if not self._wait_for_rescan():
+                    continue
+                
                 # Capture current device state
                 current_snapshot = self.device_manager.create_snapshot()
                 
                 # Handle any changes
                 self._handle_device_changes(current_snapshot)
                 
-                # Wait for next poll
-                time.sleep(self.poll_interval)
-                
             except Exception as e:
                 CoreLogger.error(f"Error in Windows hotplug monitoring loop: {e}")
                 time.sleep(self.poll_interval)
@@ -494,6 +720,8 @@ class DeviceSnapshot:
         
         # Convert to legacy format
         self.devices = [device.to_dict() for device in device_infos]
+        # Index the devices by key once; compare_with then only does lookups
+        self._by_key = {self._device_key(dev): dev for dev in self.devices}
         
     def compare_with(self, other_snapshot):
         """Compare this snapshot with another snapshot"""
@@ -503,34 +731,31 @@ class DeviceSnapshot:
             'modified_devices': []
         }
         
-        # Convert device lists to dictionaries for easier comparison
-        current_devices = {self._device_key(dev): dev for dev in self.devices}
-        other_devices = {self._device_key(dev): dev for dev in other_snapshot.devices}
+        # Both snapshots were indexed by device key when they were taken
+        current_devices = self._by_key
+        other_devices = other_snapshot._by_key
         
         # Find added devices
-        for key, device in current_devices.items():
-            if key not in other_devices:
-                changes['added_devices'].append(device)
+        changes['added_devices'] = [device for key, device in current_devices.items()
+                                    if key not in other_devices]
         
         # Find removed devices
-        for key, device in other_devices.items():
-            if key not in current_devices:
-                changes['removed_devices'].append(device)
+        changes['removed_devices'] = [device for key, device in other_devices.items()
+                                      if key not in current_devices]
         
         # Find modified devices
         for key, device in current_devices.items():
-            if key in other_devices:
-                if not self._devices_equal(device, other_devices[key]):
-                    changes['modified_devices'].append({
-                        'old': other_devices[key],
-                        'new': device
-                    })
+            old_device = other_devices.get(key)
+            if old_device is not None and not self._devices_equal(device, old_device):
+                changes['modified_devices'].append({
+                    'old': old_device,
+                    'new': device
+                })
         
         return changes
     
-    def _device_key(self, device):
-        """Generate a unique key for a device"""
-        return f"{device.get('serial_port', '')}-{device.get('HID', '')}-{device.get('camera', '')}"
+    # Devices come from DeviceInfo.to_dict(), so the key fields are always present
+    _device_key = staticmethod(itemgetter('serial_port', 'HID', 'camera'))
     
     def _devices_equal(self, dev1, dev2):
         """Check if two devices are equal"""
@@ -574,7 +799,7 @@ class HotplugMonitor:
             self.serial_vid, self.serial_pid,
             self.hid_vid, self.hid_pid
         )
-        self.last_snapshot = copy.deepcopy(self.initial_snapshot)
+        self.last_snapshot = self.initial_snapshot
         
         CoreLogger.info(f"Initial device snapshot captured at {self.initial_snapshot.timestamp}")
         CoreLogger.info(f"Found {len(self.initial_snapshot.devices)} initial devices")
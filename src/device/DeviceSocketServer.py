@@ -1,8 +1,21 @@
 import socket
 import json
+import selectors
 import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from serialPort.SerialManager import SerialManager
 
+# Commands that enumerate devices; a worker runs them so the selector loop keeps serving
+SLOW_COMMANDS = frozenset(('discover', 'select'))
+
+
+def _json_default(value):
+    """Encode the bytes HID paths in pushed events"""
+    if isinstance(value, bytes):
+        return value.decode('utf-8', 'replace')
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
 
 class DeviceSocketServer:
     """
@@ -11,14 +24,42 @@ class DeviceSocketServer:
     Provides JSON-based API for device discovery, selection, and control
     """
     
-    def __init__(self, device_manager, host='localhost', port=16688):
+    def __init__(self, device_manager, host='localhost', port=16688, stop_event=None):
         self.device_manager = device_manager
         self.client_selected_devices = {}  # Track selected devices per client
         self.host = host
         self.port = port
         self.socket_server = None
         self.socket_thread = None
+        # One selector serves the listening socket and every client connection
+        self.selector = None
+        self.client_addresses = {}  # client socket -> (host, port)
+        self.client_sockets = {}  # client id -> client socket
+        # Client sockets are non-blocking; output they can't take yet waits here and is
+        # sent when the selector reports them writable. A client whose unsent output grows
+        # past max_output_bytes has stopped reading and is disconnected.
+        self.client_outboxes = {}  # client socket -> bytearray of unsent output
+        self.max_output_bytes = 1 << 20
+        # Slow commands run on a worker and post their response back through the wakeup
+        # socketpair; a client's next command is not read until it has been answered
+        self.command_executor = None
+        self.busy_clients = set()
+        self.completed_commands = deque()  # (client socket, client id, encoded response)
+        # Device change push: each subscriber has a queue of encoded events that the selector
+        # loop moves into its outbox; a subscriber is disconnected when its outbox overflows,
+        # or when max_pending_events pile up before the loop gets to them.
+        # Recent events are kept so a reconnecting client can catch up from its last event id.
+        self.max_pending_events = 64
+        self.subscribers = {}  # client id -> deque of pending event messages
+        self.evicted_subscribers = set()
+        self.event_history = deque(maxlen=64)  # (event id, message)
+        self.last_event_id = 0
+        self.events_lock = threading.Lock()
+        self._wakeup_recv = None
+        self._wakeup_send = None
         self.running = True
+        # Set once the server stops, for owners that want to wait on it
+        self.stop_event = stop_event if stop_event is not None else threading.Event()
         
     def start_server(self):
         """Start the socket server"""
@@ -27,10 +68,22 @@ class DeviceSocketServer:
             self.socket_server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
             self.socket_server.bind((self.host, self.port))
             self.socket_server.listen(5)
+            # A client may go away between the readiness report and accept()
+            self.socket_server.setblocking(False)
+            
+            self.selector = selectors.DefaultSelector()
+            self.selector.register(self.socket_server, selectors.EVENT_READ, self.accept_client)
+            # Other threads publish events and finish commands; a byte on this pair wakes the
+            # loop to deliver them
+            self._wakeup_recv, self._wakeup_send = socket.socketpair()
+            self._wakeup_recv.setblocking(False)
+            self._wakeup_send.setblocking(False)
+            self.selector.register(self._wakeup_recv, selectors.EVENT_READ, self.deliver_events)
+            self.command_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="socket-command")
             
             print(f"\n🌐 Socket server started on {self.host}:{self.port}")
             print("📡 Waiting for client connections to control devices...")
-            print("🎮 Available commands: discover, select, serial, camera, hid, status, stop")
+            print("🎮 Available commands: discover, select, serial, camera, hid, status, subscribe, unsubscribe, stop")
             
             self.socket_thread = threading.Thread(target=self.handle_socket_connections)
             self.socket_thread.daemon = True
@@ -43,53 +96,235 @@ class DeviceSocketServer:
             return False
 
     def handle_socket_connections(self):
-        """Handle incoming socket connections"""
-        while self.running:
-            try:
-                client_socket, address = self.socket_server.accept()
-                print(f"🔗 Client connected from {address}")
-                
-                client_thread = threading.Thread(
-                    target=self.handle_client, 
-                    args=(client_socket, address)
-                )
-                client_thread.daemon = True
-                client_thread.start()
-                
-            except Exception as e:
-                if self.running:
-                    print(f"❌ Socket connection error: {e}")
-
-    def handle_client(self, client_socket, address):
-        """Handle individual client commands"""
+        """Serve the listening socket and all clients from one selector loop"""
         try:
-            # Initialize client session
-            client_id = f"{address[0]}:{address[1]}"
-            self.client_selected_devices[client_id] = None
-            
             while self.running:
+                # The timeout bounds how long a stop takes to be noticed
+                for key, mask in self.selector.select(timeout=0.5):
+                    key.data(key.fileobj, mask)
+        except Exception as e:
+            if self.running:
+                print(f"❌ Socket connection error: {e}")
+        finally:
+            for client_socket in list(self.client_addresses):
+                self.close_client(client_socket)
+            # A command still running finishes on its own; its response has nowhere to go
+            self.command_executor.shutdown(wait=False)
+            self.selector.close()
+            self.socket_server.close()
+            self._wakeup_recv.close()
+            self._wakeup_send.close()
+
+    def accept_client(self, server_socket, mask):
+        """Accept a pending connection and watch it for commands"""
+        try:
+            client_socket, address = server_socket.accept()
+        except BlockingIOError:
+            return
+        except OSError as e:
+            if self.running:
+                print(f"❌ Socket connection error: {e}")
+            return
+        print(f"🔗 Client connected from {address}")
+        
+        # Initialize client session
+        client_id = f"{address[0]}:{address[1]}"
+        self.client_selected_devices[client_id] = None
+        self.client_addresses[client_socket] = address
+        self.client_sockets[client_id] = client_socket
+        self.client_outboxes[client_socket] = bytearray()
+        # Never block the loop on one client: reads happen when the selector reports data,
+        # and writes go through the client's outbox
+        client_socket.setblocking(False)
+        self.selector.register(client_socket, selectors.EVENT_READ, self.handle_client)
+
+    def handle_client(self, client_socket, mask):
+        """Send pending output to a writable client and handle a command from a readable one"""
+        if mask & selectors.EVENT_WRITE:
+            self.flush_client(client_socket)
+        if not mask & selectors.EVENT_READ or client_socket not in self.client_addresses:
+            return
+        
+        address = self.client_addresses[client_socket]
+        client_id = f"{address[0]}:{address[1]}"
+        try:
+            try:
                 data = client_socket.recv(1024).decode('utf-8')
-                if not data:
-                    break
+            except BlockingIOError:
+                return
+            if not data:
+                self.close_client(client_socket)
+                return
+            
+            # Responses end with a newline like pushed events, so subscribers can split the stream
+            try:
+                command = json.loads(data)
+            except json.JSONDecodeError:
+                self.send_to_client(client_socket, self.encode_response({"error": "Invalid JSON format"}))
+                return
+            
+            if command.get('type', '').lower() in SLOW_COMMANDS:
+                # Stop reading from the client until the worker has answered
+                self.busy_clients.add(client_socket)
+                self.update_interest(client_socket)
+                self.command_executor.submit(self.run_slow_command, client_socket, command, client_id)
+                return
+            response = self.process_device_command(command, client_id)
+            self.send_to_client(client_socket, self.encode_response(response))
                 
-                try:
-                    command = json.loads(data)
-                    response = self.process_device_command(command, client_id)
-                    client_socket.send(json.dumps(response).encode('utf-8'))
-                    
-                except json.JSONDecodeError:
-                    error_response = {"error": "Invalid JSON format"}
-                    client_socket.send(json.dumps(error_response).encode('utf-8'))
-                    
         except Exception as e:
             print(f"❌ Client {address} error: {e}")
-        finally:
+            self.close_client(client_socket)
+
+    @staticmethod
+    def encode_response(response):
+        """Encode a command response as one newline-terminated JSON line"""
+        return json.dumps(response).encode('utf-8') + b"\n"
+
+    def run_slow_command(self, client_socket, command, client_id):
+        """Worker thread: run a command that enumerates devices and post its response to the loop"""
+        try:
+            message = self.encode_response(self.process_device_command(command, client_id))
+        except Exception as e:
+            message = self.encode_response({"error": f"Command error: {str(e)}"})
+        with self.events_lock:
+            self.completed_commands.append((client_socket, client_id, message))
+        self.wake_selector()
+
+    def send_to_client(self, client_socket, data):
+        """Queue data for a client and send as much of it as the socket takes right away"""
+        outbox = self.client_outboxes.get(client_socket)
+        if outbox is None:
+            return
+        outbox += data
+        self.flush_client(client_socket)
+        if len(outbox) > self.max_output_bytes and client_socket in self.client_addresses:
+            print(f"⚠️  Disconnecting slow client {self.client_addresses[client_socket]}")
+            self.close_client(client_socket)
+
+    def flush_client(self, client_socket):
+        """Send a client's queued output until it is empty or the socket would block"""
+        outbox = self.client_outboxes.get(client_socket)
+        if outbox is None:
+            return
+        try:
+            while outbox:
+                sent = client_socket.send(outbox)
+                del outbox[:sent]
+        except BlockingIOError:
+            pass
+        except OSError as e:
+            print(f"❌ Client {self.client_addresses.get(client_socket)} error: {e}")
+            self.close_client(client_socket)
+            return
+        self.update_interest(client_socket)
+
+    def update_interest(self, client_socket):
+        """Watch a client for commands unless one is in flight, and for writability while output is queued"""
+        events = 0 if client_socket in self.busy_clients else selectors.EVENT_READ
+        if self.client_outboxes[client_socket]:
+            events |= selectors.EVENT_WRITE
+        key = self.selector.get_map().get(client_socket)
+        if not events:
+            if key is not None:
+                self.selector.unregister(client_socket)
+        elif key is None:
+            self.selector.register(client_socket, events, self.handle_client)
+        elif key.events != events:
+            self.selector.modify(client_socket, events, self.handle_client)
+
+    def close_client(self, client_socket):
+        """Forget a client's session and close its connection"""
+        address = self.client_addresses.pop(client_socket, None)
+        self.client_outboxes.pop(client_socket, None)
+        self.busy_clients.discard(client_socket)
+        try:
+            self.selector.unregister(client_socket)
+        except (KeyError, ValueError):
+            pass
+        client_socket.close()
+        if address is not None:
             # Clean up client session
-            if client_id in self.client_selected_devices:
-                del self.client_selected_devices[client_id]
-            client_socket.close()
+            client_id = f"{address[0]}:{address[1]}"
+            self.client_selected_devices.pop(client_id, None)
+            self.client_sockets.pop(client_id, None)
+            with self.events_lock:
+                self.subscribers.pop(client_id, None)
+                self.evicted_subscribers.discard(client_id)
             print(f"🔌 Client {address} disconnected")
 
+    def publish_device_change(self, event_data):
+        """
+        Push a hotplug monitor change event to the subscribed clients; safe to call from any thread
+        
+        Clients receive one JSON object per line:
+        {"event": "device_change", "id": ..., "timestamp": ..., "added": [...], "removed": [...],
+         "modified": [{"old": ..., "new": ...}], "device_count": ...}
+        """
+        changes = event_data['changes_from_last']
+        with self.events_lock:
+            self.last_event_id += 1
+            message = json.dumps({
+                "event": "device_change",
+                "id": self.last_event_id,
+                "timestamp": event_data['timestamp'].isoformat(),
+                "added": changes['added_devices'],
+                "removed": changes['removed_devices'],
+                "modified": [{"old": change['old'].as_dict(), "new": change['new'].as_dict()}
+                             for change in changes['modified_devices']],
+                "device_count": len(event_data['current_devices'])
+            }, default=_json_default).encode('utf-8') + b"\n"
+            self.event_history.append((self.last_event_id, message))
+            for client_id, pending in self.subscribers.items():
+                if len(pending) >= self.max_pending_events:
+                    self.evicted_subscribers.add(client_id)
+                else:
+                    pending.append(message)
+        self.wake_selector()
+
+    def wake_selector(self):
+        """Make the selector loop deliver pending events"""
+        try:
+            self._wakeup_send.send(b"\0")
+        except (BlockingIOError, AttributeError, OSError):
+            # Already woken (buffer full), or the server isn't running
+            pass
+
+    def deliver_events(self, wakeup_socket, mask):
+        """Selector callback: send finished commands' responses and every subscriber its pending events"""
+        try:
+            while wakeup_socket.recv(4096):
+                pass
+        except BlockingIOError:
+            pass
+        
+        with self.events_lock:
+            completed = list(self.completed_commands)
+            self.completed_commands.clear()
+            evicted = [self.client_sockets.get(client_id) for client_id in self.evicted_subscribers]
+            self.evicted_subscribers.clear()
+            outgoing = []
+            for client_id, pending in self.subscribers.items():
+                if pending:
+                    outgoing.append((self.client_sockets.get(client_id), b"".join(pending)))
+                    pending.clear()
+        
+        for client_socket, client_id, message in completed:
+            self.busy_clients.discard(client_socket)
+            if client_socket not in self.client_addresses:
+                # Disconnected while the command ran; drop any selection it made
+                self.client_selected_devices.pop(client_id, None)
+                continue
+            # Queues the response and resumes reading the client's commands
+            self.send_to_client(client_socket, message)
+        for client_socket in evicted:
+            if client_socket is not None:
+                print(f"⚠️  Disconnecting slow subscriber {self.client_addresses.get(client_socket)}")
+                self.close_client(client_socket)
+        for client_socket, data in outgoing:
+            if client_socket is not None and client_socket in self.client_addresses:
+                self.send_to_client(client_socket, data)
+
     def process_device_command(self, command, client_id):
         """Process device control commands"""
         cmd_type = command.get('type', '').lower()
@@ -106,12 +341,52 @@ class DeviceSocketServer:
             return self.handle_hid_command(command, client_id)
         elif cmd_type == 'status':
             return self.get_device_status(client_id)
+        elif cmd_type == 'subscribe':
+            return self.handle_subscribe_command(command, client_id)
+        elif cmd_type == 'unsubscribe':
+            return self.handle_unsubscribe_command(client_id)
         elif cmd_type == 'stop':
             self.running = False
+            self.stop_event.set()
             return {"status": "Stopping server"}
         else:
             return {"error": f"Unknown command type: {cmd_type}"}
 
+    def handle_subscribe_command(self, command, client_id):
+        """Start pushing device change events to the client, replaying those after last_event_id"""
+        last_seen = command.get('last_event_id')
+        with self.events_lock:
+            pending = deque()
+            if last_seen is not None:
+                try:
+                    last_seen = int(last_seen)
+                except (TypeError, ValueError):
+                    return {"error": "last_event_id must be an integer"}
+                pending.extend(message for event_id, message in self.event_history if event_id > last_seen)
+            self.subscribers[client_id] = pending
+            replayed = len(pending)
+            last_event_id = self.last_event_id
+        if replayed:
+            self.wake_selector()
+        
+        return {
+            "status": "success",
+            "action": "subscribe",
+            "last_event_id": last_event_id,
+            "replayed": replayed,
+            "message": "Subscribed to device change events"
+        }
+
+    def handle_unsubscribe_command(self, client_id):
+        """Stop pushing device change events to the client"""
+        with self.events_lock:
+            subscribed = self.subscribers.pop(client_id, None) is not None
+        return {
+            "status": "success",
+            "action": "unsubscribe",
+            "message": "Unsubscribed from device change events" if subscribed else "Not subscribed"
+        }
+
     def handle_discover_command(self):
         """Handle device discovery command"""
         try:
@@ -615,6 +890,10 @@ class DeviceSocketServer:
     def stop_server(self):
         """Stop the socket server"""
         self.running = False
+        self.stop_event.set()
+        if self.socket_thread and self.socket_thread is not threading.current_thread():
+            # The selector loop closes the client connections on its way out
+            self.socket_thread.join(timeout=2.0)
         if self.socket_server:
             try:
                 self.socket_server.close()
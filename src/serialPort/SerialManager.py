@@ -1,5 +1,7 @@
 import serial
 from serialPort.Ch9329 import  *
+import os
+import sys
 import time
 import logging
 import struct
@@ -349,6 +351,8 @@ class SerialManager:
             self.ser_port.rts = False
             self.logger.debug(f"Set RTS to low on {device_path}")
             
+            self._enable_low_latency(device_path)
+            
             self.logger.info(f"Successfully opened serial port: {device_path} at {baudrate} baud")
             return True
         except serial.SerialException as e:
@@ -357,6 +361,32 @@ class SerialManager:
                 self.event_callback("connection_failed", device_path)
             return False
     
+    def _enable_low_latency(self, device_path: str):
+        """
+        Ask the USB-serial driver to pass received bytes on immediately instead of batching
+        them (FTDI adapters hold them for up to 16 ms by default). Linux only; best effort
+        """
+        if not sys.platform.startswith('linux'):
+            return
+        
+        try:
+            self.ser_port.set_low_latency_mode(True)
+            self.logger.debug(f"Enabled low latency mode on {device_path}")
+        except (AttributeError, ValueError) as e:
+            # Older pyserial, or a driver that doesn't support TIOCSSERIAL
+            self.logger.debug(f"Low latency mode not available on {device_path}: {e}")
+        
+        # ftdi_sio exposes its latency timer in sysfs; other drivers don't have the file
+        tty_name = os.path.basename(os.path.realpath(device_path))
+        latency_timer = f"/sys/bus/usb-serial/devices/{tty_name}/latency_timer"
+        if os.path.exists(latency_timer):
+            try:
+                with open(latency_timer, 'w') as f:
+                    f.write('1')
+                self.logger.debug(f"Set latency timer of {device_path} to 1 ms")
+            except OSError as e:
+                self.logger.debug(f"Cannot set latency timer of {device_path}: {e}")
+    
     def close_port(self):
         """Close serial port"""
         if self.ser_port and self.ser_port.is_open:
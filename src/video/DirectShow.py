@@ -0,0 +1,121 @@
+"""
+In-process DirectShow device enumeration (Windows only, requires comtypes).
+
+Produces the same "Alternative name" strings that `ffmpeg -f dshow -list_devices true`
+prints, without launching ffmpeg.
+"""
+import ctypes
+from concurrent.futures import ThreadPoolExecutor
+from ctypes import wintypes
+
+import comtypes
+import comtypes.client
+from comtypes import GUID, IUnknown, COMMETHOD, HRESULT
+
+CLSID_SystemDeviceEnum = GUID("{62BE5D10-60EB-11D0-BD3B-00A0C911CE86}")
+CLSID_VideoInputDeviceCategory = GUID("{860BB310-5D01-11D0-BD3B-00A0C911CE86}")
+CLSID_AudioInputDeviceCategory = GUID("{33D9A762-90C8-11D0-BD43-00A0C911CE86}")
+
+
+class IMoniker(IUnknown):
+    _iid_ = GUID("{0000000F-0000-0000-C000-000000000046}")
+    # Only GetDisplayName is called; the preceding slots keep the vtable layout
+    # (IPersist, IPersistStream, then IMoniker methods in declaration order).
+    _methods_ = [
+        COMMETHOD([], HRESULT, "GetClassID", (["in"], ctypes.c_void_p)),
+        COMMETHOD([], HRESULT, "IsDirty"),
+        COMMETHOD([], HRESULT, "Load", (["in"], ctypes.c_void_p)),
+        COMMETHOD([], HRESULT, "Save", (["in"], ctypes.c_void_p), (["in"], wintypes.BOOL)),
+        COMMETHOD([], HRESULT, "GetSizeMax", (["in"], ctypes.c_void_p)),
+        COMMETHOD([], HRESULT, "BindToObject", (["in"], ctypes.c_void_p), (["in"], ctypes.c_void_p),
+                  (["in"], ctypes.c_void_p), (["in"], ctypes.c_void_p)),
+        COMMETHOD([], HRESULT, "BindToStorage", (["in"], ctypes.c_void_p), (["in"], ctypes.c_void_p),
+                  (["in"], ctypes.c_void_p), (["in"], ctypes.c_void_p)),
+        COMMETHOD([], HRESULT, "Reduce", (["in"], ctypes.c_void_p), (["in"], wintypes.DWORD),
+                  (["in"], ctypes.c_void_p), (["in"], ctypes.c_void_p)),
+        COMMETHOD([], HRESULT, "ComposeWith", (["in"], ctypes.c_void_p), (["in"], wintypes.BOOL),
+                  (["in"], ctypes.c_void_p)),
+        COMMETHOD([], HRESULT, "Enum", (["in"], wintypes.BOOL), (["in"], ctypes.c_void_p)),
+        COMMETHOD([], HRESULT, "IsEqual", (["in"], ctypes.c_void_p)),
+        COMMETHOD([], HRESULT, "Hash", (["in"], ctypes.c_void_p)),
+        COMMETHOD([], HRESULT, "IsRunning", (["in"], ctypes.c_void_p), (["in"], ctypes.c_void_p),
+                  (["in"], ctypes.c_void_p)),
+        COMMETHOD([], HRESULT, "GetTimeOfLastChange", (["in"], ctypes.c_void_p), (["in"], ctypes.c_void_p),
+                  (["in"], ctypes.c_void_p)),
+        COMMETHOD([], HRESULT, "Inverse", (["in"], ctypes.c_void_p)),
+        COMMETHOD([], HRESULT, "CommonPrefixWith", (["in"], ctypes.c_void_p), (["in"], ctypes.c_void_p)),
+        COMMETHOD([], HRESULT, "RelativePathTo", (["in"], ctypes.c_void_p), (["in"], ctypes.c_void_p)),
+        COMMETHOD([], HRESULT, "GetDisplayName",
+                  (["in"], ctypes.c_void_p, "pbc"),
+                  (["in"], ctypes.c_void_p, "pmkToLeft"),
+                  (["out"], ctypes.POINTER(ctypes.c_void_p), "ppszDisplayName")),
+    ]
+
+
+class IEnumMoniker(IUnknown):
+    _iid_ = GUID("{00000102-0000-0000-C000-000000000046}")
+    _methods_ = [
+        COMMETHOD([], HRESULT, "Next",
+                  (["in"], wintypes.ULONG, "celt"),
+                  (["out"], ctypes.POINTER(ctypes.POINTER(IMoniker)), "rgelt"),
+                  (["out"], ctypes.POINTER(wintypes.ULONG), "pceltFetched")),
+    ]
+
+
+class ICreateDevEnum(IUnknown):
+    _iid_ = GUID("{29840822-5B84-11D0-BD3B-00A0C911CE86}")
+    _methods_ = [
+        COMMETHOD([], HRESULT, "CreateClassEnumerator",
+                  (["in"], ctypes.POINTER(GUID), "clsidDeviceClass"),
+                  (["out"], ctypes.POINTER(ctypes.POINTER(IEnumMoniker)), "ppEnumMoniker"),
+                  (["in"], wintypes.DWORD, "dwFlags")),
+    ]
+
+
+CoTaskMemFree = ctypes.windll.ole32.CoTaskMemFree
+CoTaskMemFree.argtypes = [ctypes.c_void_p]
+CoTaskMemFree.restype = None
+
+
+def _moniker_display_name(moniker):
+    name_ptr = moniker.GetDisplayName(None, None)
+    try:
+        name = ctypes.wstring_at(name_ptr)
+    finally:
+        CoTaskMemFree(name_ptr)
+    # ffmpeg replaces ':' with '_' because it uses ':' to separate video/audio sources
+    return name.replace(':', '_')
+
+
+def list_category(dev_enum, category):
+    """Return the alternative names of all devices in a DirectShow category"""
+    names = []
+    enum_moniker = dev_enum.CreateClassEnumerator(ctypes.byref(category), 0)
+    if not enum_moniker:
+        # S_FALSE: the category is empty
+        return names
+    while True:
+        moniker, fetched = enum_moniker.Next(1)
+        if not fetched:
+            break
+        names.append(_moniker_display_name(moniker))
+    return names
+
+
+# Every enumeration runs on this one long-lived thread, which initialises COM once when
+# it starts. Callers may come from short-lived threads, and initialising COM on each of
+# them would leak an apartment per call (the interface pointers are released whenever
+# comtypes garbage collects them, so CoUninitialize can't safely follow each call).
+_com_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="directshow",
+                                   initializer=comtypes.CoInitialize)
+
+
+def _list_devices():
+    dev_enum = comtypes.client.CreateObject(CLSID_SystemDeviceEnum, interface=ICreateDevEnum)
+    return (list_category(dev_enum, CLSID_VideoInputDeviceCategory) +
+            list_category(dev_enum, CLSID_AudioInputDeviceCategory))
+
+
+def list_devices():
+    """Return alternative names of all video input devices followed by audio input devices"""
+    return _com_executor.submit(_list_devices).result()
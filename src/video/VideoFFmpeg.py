@@ -2,7 +2,44 @@ import subprocess
 import re
 import os
 
+_ALTERNATIVE_NAME_RE = re.compile(r'Alternative name\s*"([^"]+)"')
+# Lines ffmpeg prints once it has finished listing dshow devices
+_LIST_END_MARKERS = ("Immediate exit requested", "No such device")
+# Devnode instance ID in a PnP alternative name: @device_pnp_\\?\usb#vid_...#<instance>#{guid}\...
+_PNP_INSTANCE_RE = re.compile(r'#([^#]+)#\{')
+# Endpoint GUID in a wave input alternative name: @device_cm_{category}\wave_{guid}
+_WAVE_ID_RE = re.compile(r'wave_(\{[^}]+\})', re.IGNORECASE)
+
 def list_windows_devices():
+    """
+    List DirectShow video and audio input devices by their alternative names.
+    Enumerates in-process through DirectShow when comtypes is available,
+    otherwise, or if the COM enumeration fails, falls back to parsing
+    `ffmpeg -list_devices` output.
+    """
+    try:
+        from video import DirectShow
+    except ImportError:
+        return list_windows_devices_ffmpeg()
+    try:
+        return DirectShow.list_devices()
+    except Exception as e:
+        print("DirectShow enumeration failed, falling back to ffmpeg:", e)
+        return list_windows_devices_ffmpeg()
+
+def index_windows_devices(devs):
+    """
+    Key DirectShow alternative names by the lowercased devnode instance ID (video)
+    or wave endpoint GUID (audio) they embed, for O(1) lookup by device ID.
+    """
+    index = {}
+    for dev in devs:
+        match = _PNP_INSTANCE_RE.search(dev) or _WAVE_ID_RE.search(dev)
+        if match:
+            index[match.group(1).lower()] = dev
+    return index
+
+def list_windows_devices_ffmpeg():
 
     command = [
         'ffmpeg',
@@ -12,31 +49,34 @@ def list_windows_devices():
         '-i', 'dummy'
     ]
     try:
-        result = subprocess.run(
+        process = subprocess.Popen(
             command,
             stdout=subprocess.PIPE,
             stderr=subprocess.STDOUT,
             text=True,
             encoding='utf-8',
-            errors='replace'
+            errors='replace',
+            bufsize=1
         )
 
-        output = result.stdout
-        
-        lines = output.splitlines()
-
         device = []
-        for line in lines:
-            line = line.strip()
-            if "Alternative name" in line:
-                match = re.search(r'"(.*?)"', line)
+        try:
+            for line in process.stdout:
+                match = _ALTERNATIVE_NAME_RE.search(line)
                 if match:
                     device.append(match.group(1))
+                elif any(marker in line for marker in _LIST_END_MARKERS):
+                    # The device list is complete; don't wait for ffmpeg to shut down
+                    break
+        finally:
+            process.kill()
+            process.stdout.close()
+            process.wait()
         return device
 
     except Exception as e:
         print("Error:", e)
-        return [], []
+        return []
 
 def start_stream(video_input, audio_input, rtp_video_url, platform="windows"):
     if platform == "windows":